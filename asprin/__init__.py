@@ -28,3 +28,15 @@ __email__ = 'javier@cs.uni-potsdam.de'
 __license__ = 'MIT'
 __version__ = '3.1.1'
 __url__ = 'https://github.com/potassco/asprin'
+
+
+# library API (see src/main/api.py)
+def solve(inputs, options=None):
+    from .src.main import api
+    return api.solve(inputs, options)
+
+
+# asyncio API (see src/main/aio.py)
+def solve_async(inputs, options=None, timeout=None, conflicts=None):
+    from .src.main import aio
+    return aio.solve(inputs, options, timeout, conflicts)
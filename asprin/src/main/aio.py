@@ -0,0 +1,147 @@
+# MIT License
+#
+# Copyright (c) 2017 Javier Romero
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# asyncio API (Python 3.5+)
+#
+# Usage:
+#   import asprin
+#   async def main():
+#       async for model in asprin.solve_async(["encoding.lp"], "0",
+#                                             timeout=10, conflicts=10000):
+#           print(model.number, model.optimal, model.shown)
+#
+# Like api.solve, but models are awaited instead of blocking the event loop.
+# Cancelling the task that iterates stops the solving, and the iteration
+# ends when the timeout (in seconds) or the conflicts limit is reached
+# (the latter is checked between solve calls).
+# Attribute timed_out tells whether a limit was reached.
+#
+
+import asyncio
+from . import api
+
+
+#
+# Events
+#
+# Receives the events from the solving thread
+#
+
+class Events:
+
+    def __init__(self, loop, queue):
+        self.loop  = loop
+        self.queue = queue
+
+    def put(self, event):
+        try:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, event)
+        except RuntimeError: # the loop is closed
+            pass
+
+
+#
+# AsyncSolve
+#
+
+class AsyncSolve:
+
+    def __init__(self, inputs, options=None, timeout=None, conflicts=None,
+                 spec_cache=None):
+        self.inputs     = inputs
+        self.options    = api.get_options(options)
+        self.timeout    = timeout
+        self.conflicts  = conflicts
+        self.spec_cache = spec_cache
+        self.listener   = None
+        self.thread     = None
+        self.queue      = None
+        self.timer      = None
+        self.done       = False
+        self.timed_out  = False
+
+    def __start(self):
+        loop = asyncio.get_event_loop()
+        self.queue = asyncio.Queue()
+        self.listener, self.thread = api.start(
+            self.inputs, self.options, Events(loop, self.queue),
+            self.spec_cache, self.conflicts
+        )
+        if self.timeout is not None:
+            self.timer = loop.call_later(self.timeout, self.__on_timeout)
+
+    def __on_timeout(self):
+        self.timed_out = True
+        self.listener.stop()
+
+    def __finish(self):
+        self.done = True
+        if self.timer is not None:
+            self.timer.cancel()
+        if self.listener.limited:
+            self.timed_out = True
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.done:
+            raise StopAsyncIteration
+        if self.queue is None:
+            self.__start()
+        try:
+            event = await self.queue.get()
+        except asyncio.CancelledError:
+            await self.aclose()
+            raise
+        if event == api.END:
+            self.__finish()
+            raise StopAsyncIteration
+        if isinstance(event, Exception):
+            self.__finish()
+            raise event
+        return event
+
+    # stops solving and waits for the solving thread
+    async def aclose(self):
+        if self.queue is None:
+            self.done = True
+            return
+        if not self.done:
+            self.listener.stop()
+            self.__finish()
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(None, self.thread.join)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.aclose()
+
+
+# returns an asynchronous iterator of api.Model objects
+def solve(inputs, options=None, timeout=None, conflicts=None,
+          spec_cache=None):
+    return AsyncSolve(inputs, options, timeout, conflicts, spec_cache)
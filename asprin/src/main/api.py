@@ -0,0 +1,270 @@
+# MIT License
+#
+# Copyright (c) 2017 Javier Romero
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Library API
+#
+# Usage:
+#   import asprin
+#   for model in asprin.solve(["encoding.lp", "a. b."], "0"):
+#       print(model.number, model.optimal, model.shown)
+#
+# Every input is a file name or, otherwise, a program string, and
+# options are the command line options (a string or a list of strings).
+# Nothing is printed and no signal handlers are installed.
+# The models are computed in a separate thread, and only one call is
+# parsing at a time (asprin keeps some state in class variables).
+# Closing the generator stops the solving.
+# For asyncio, see aio.py.
+#
+
+from __future__ import print_function
+import os
+import sys
+import time
+import shlex
+import tempfile
+import threading
+from .                      import      main
+from ..utils                import   printer
+from ..utils                import     utils
+from ..spec_parser          import       ast
+from ..program_parser       import   visitor
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+#
+# DEFINES
+#
+
+END = "end"
+ERROR_OPTIONS = "incorrect options: {}"
+ERROR_SOLVING = "solving failed with code {}"
+ERROR_CONFLICTS = "incorrect conflicts limit: {}"
+LOCK = threading.Lock()
+
+
+#
+# Model
+#
+
+class Model:
+
+    def __init__(self, number, shown, holds, stats):
+        self.number  = number  # as in Answer: <number>
+        self.shown   = shown   # list of clingo.Symbol
+        self.holds   = holds   # formulas of the preference specification
+        self.optimal = False   # set when known
+        self.stats   = stats   # dict with keys 'step' and 'time'
+
+    def to_dict(self):
+        return {
+            "number"  : self.number,
+            "optimal" : self.optimal,
+            "shown"   : [str(x) for x in self.shown],
+            "holds"   : [str(x) for x in self.holds],
+            "stats"   : self.stats
+        }
+
+    def __repr__(self):
+        return "Model({}, optimal={}, shown=[{}])".format(
+            self.number, self.optimal, " ".join([str(x) for x in self.shown])
+        )
+
+
+#
+# Listener
+#
+# Receives the answers and optimality messages of the solver,
+# and puts the models in the queue when their status is known
+# (conflicts limits the number of conflicts, checked between solve calls)
+#
+
+class Listener:
+
+    def __init__(self, events, conflicts=None):
+        self.events    = events
+        self.solver    = None
+        self.model     = None
+        self.stopped   = False
+        self.limited   = False
+        self.start     = time.time()
+        self.conflicts = conflicts
+        self.used      = 0
+        self.lock      = False
+
+    # once the solver is created, other calls may start parsing
+    # (but not with --retire, that parses again while solving)
+    def set_solver(self, solver):
+        self.solver = solver
+        if self.lock and solver.control_factory is None:
+            self.lock = False
+            LOCK.release()
+
+    def __count_conflicts(self):
+        try:
+            stats = self.solver.control.statistics
+            self.used += int(stats['solving']['solvers']['conflicts'])
+        except (KeyError, TypeError, RuntimeError):
+            return
+        if self.used > self.conflicts:
+            self.limited = True
+            self.stopped = True
+
+    # raises an exception to stop asprin (not inside clingo callbacks)
+    def check(self):
+        if self.conflicts is not None and self.solver is not None:
+            self.__count_conflicts()
+        if self.stopped:
+            raise utils.SilentException()
+
+    def __put(self):
+        if self.model is not None:
+            self.events.put(self.model)
+            self.model = None
+
+    def on_answer(self, solver):
+        self.__put()
+        stats = {"step" : solver.step, "time" : time.time() - self.start}
+        self.model = Model(
+            solver.models, list(solver.shown), list(solver.holds), stats
+        )
+
+    def on_status(self, solver, optimal):
+        if self.model is not None:
+            self.model.optimal = optimal
+        self.__put()
+
+    def end(self):
+        self.__put()
+
+    def stop(self):
+        self.stopped = True
+        if self.solver is not None:
+            self.solver.control.interrupt()
+
+
+#
+# solve
+#
+
+def reset():
+    ast.PStatement.bfs = False
+    visitor.Helper.underscores = None
+    printer.Printer.messages, printer.Printer.last = 0, ""
+
+
+def get_files(inputs):
+    files, temporary = [], []
+    for i in inputs:
+        if os.path.isfile(i):
+            files.append(i)
+            continue
+        fd, name = tempfile.mkstemp(suffix=".lp")
+        with os.fdopen(fd, "w") as f:
+            f.write(i)
+        files.append(name)
+        temporary.append(name)
+    return files, temporary
+
+
+def run(inputs, options, listener, events, spec_cache):
+    LOCK.acquire()
+    listener.lock = True
+    printer.set_silent(True)
+    temporary = []
+    try:
+        files, temporary = get_files(inputs)
+        reset()
+        asprin = main.Asprin(
+            listener=listener, handle_signals=False, spec_cache=spec_cache
+        )
+        asprin.run_wild(options + files)
+        listener.end()
+    except (utils.SilentException, main.solver.EndException):
+        listener.end()
+    except SystemExit as e:
+        if not listener.stopped and e.code not in [0, None]:
+            events.put(Exception(ERROR_SOLVING.format(e.code)))
+        else:
+            listener.end()
+    except Exception as e:
+        if not listener.stopped:
+            events.put(e)
+    finally:
+        if listener.lock:
+            listener.lock = False
+            LOCK.release()
+        for name in temporary:
+            os.remove(name)
+        events.put(END)
+
+
+def get_options(options):
+    if options is None:
+        options = []
+    elif not isinstance(options, (list, tuple)):
+        options = shlex.split(options)
+    if "-" in options or [i for i in options if i.startswith("--test")]:
+        raise Exception(ERROR_OPTIONS.format(" ".join(options)))
+    return list(options)
+
+
+# starts solving in a new thread, and returns the listener and the thread
+# (events needs a put method)
+def start(inputs, options, events, spec_cache=None, conflicts=None):
+    if not isinstance(inputs, (list, tuple)):
+        inputs = [inputs]
+    options = get_options(options)
+    if conflicts is not None and (type(conflicts) != int or conflicts < 0):
+        raise Exception(ERROR_CONFLICTS.format(conflicts))
+    listener = Listener(events, conflicts)
+    thread = threading.Thread(
+        target=run, args=(list(inputs), options, listener, events, spec_cache)
+    )
+    thread.daemon = True
+    thread.start()
+    return listener, thread
+
+
+# returns a generator of Model objects
+# (spec_cache is a dictionary for reusing the parsed specifications)
+def solve(inputs, options=None, spec_cache=None, conflicts=None):
+    events = queue.Queue()
+    listener, thread = start(inputs, options, events, spec_cache, conflicts)
+    try:
+        while True:
+            event = events.get()
+            if event == END:
+                break
+            if isinstance(event, Exception):
+                raise event
+            yield event
+    finally:
+        # stop solving if the generator is closed
+        if thread.is_alive():
+            listener.stop()
+        thread.join()
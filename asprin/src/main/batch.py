@@ -0,0 +1,139 @@
+# MIT License
+#
+# Copyright (c) 2017 Javier Romero
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Batch
+#
+# asprin --batch=<d>[,<w>] [files] [options]
+#
+# Solves every instance in <d> (a directory, or a file with one instance
+# file per line) together with the other files, using <w> worker processes.
+# The instances are loaded directly into clingo (as with option
+# --to-clingo), so they should not contain preference statements, and the
+# other files are parsed once per worker and reused for all instances.
+# Only the specification parsing is reused: the base program is grounded and
+# the preference programs are translated again for every instance, because
+# the translation depends on the ground base program with the instance.
+# For every instance, a JSON line is written to stdout:
+#   {"instance": "i.lp", "models": [...], "optimal": 1, "time": 0.1}
+# and a summary is written to stderr at the end.
+#
+
+from __future__ import print_function
+import os
+import sys
+import json
+import time
+import multiprocessing
+from . import api
+
+
+#
+# DEFINES
+#
+
+BATCH = "--batch"
+TO_CLINGO = "--to-clingo="
+ERROR_BATCH = "incorrect value for option --batch: {}"
+ERROR_FILES = "option --batch requires some file shared by all instances"
+SUMMARY = """
+Instances    : {} ({} errors)
+Time         : {:.3f}s
+Throughput   : {:.3f} instances/s"""
+
+# in the worker processes
+CACHE = None
+
+
+#
+# worker processes
+#
+
+def init_worker():
+    global CACHE
+    CACHE = {}
+
+def solve_instance(job):
+    instance, options = job
+    start = time.time()
+    result = {"instance" : instance}
+    try:
+        models = [m.to_dict() for m in
+                  api.solve([], options + [TO_CLINGO + instance], CACHE)]
+        result["models"] = models
+        result["optimal"] = len([m for m in models if m["optimal"]])
+    except Exception as e:
+        result["error"] = str(e)
+    result["time"] = time.time() - start
+    return result
+
+
+#
+# batch
+#
+
+def get_instances(path):
+    if os.path.isdir(path):
+        return [os.path.join(path, i) for i in sorted(os.listdir(path))
+                if os.path.isfile(os.path.join(path, i))]
+    with open(path) as f:
+        return [i.strip() for i in f.read().splitlines() if i.strip()]
+
+def parse_args(args):
+    path, workers, options = None, 1, []
+    for i in args:
+        if i.startswith(BATCH + "="):
+            value = i[len(BATCH + "="):].rsplit(",", 1)
+            path = value[0]
+            try:
+                if len(value) == 2:
+                    workers = int(value[1])
+                if workers < 1 or not os.path.exists(path):
+                    raise ValueError
+            except ValueError:
+                print(ERROR_BATCH.format(i), file=sys.stderr)
+                sys.exit(1)
+        else:
+            options.append(i)
+    if not [i for i in options if os.path.isfile(i)]:
+        print(ERROR_FILES, file=sys.stderr)
+        sys.exit(1)
+    return path, workers, options
+
+def main(args):
+    path, workers, options = parse_args(args)
+    jobs = [(i, options) for i in get_instances(path)]
+    start, errors = time.time(), 0
+    pool = multiprocessing.Pool(workers, init_worker)
+    try:
+        for result in pool.imap_unordered(solve_instance, jobs):
+            errors += 1 if "error" in result else 0
+            sys.stdout.write(json.dumps(result) + "\n")
+            sys.stdout.flush()
+    finally:
+        pool.close()
+        pool.join()
+    elapsed = time.time() - start
+    throughput = len(jobs) / elapsed if elapsed > 0 else 0
+    print(SUMMARY.format(len(jobs), errors, elapsed, throughput),
+          file=sys.stderr)
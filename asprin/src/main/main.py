@@ -33,6 +33,7 @@ import sys
 import clingo
 import os
 import errno
+import copy
 from ..spec_parser    import           spec_parser
 from ..program_parser import        program_parser
 from ..solver         import                solver
@@ -41,6 +42,8 @@ from ..utils          import clingo_signal_handler
 from ..utils          import                 utils
 from .                import           clingo_help
 from ..solver.metasp  import                metasp
+from ..solver         import              schedule
+from ..solver         import                   lns
 
 
 #
@@ -67,8 +70,49 @@ ERROR_PARSING  = "parsing failed"
 #ERROR_IMPROVE_1 = "options --stats and --improve-limit cannot be used together"
 ERROR_IMPROVE_2 = """incorrect value for option --improve-limit, \
 options reprint and nocheck cannot be used together"""
+ERROR_QUERIES_META = """option --queries can only be used together with \
+option --meta=simple"""
+ERROR_QUERIES_ON_OPT_HEUR = """options --queries and --on-opt-heur cannot be \
+used together"""
+ERROR_QUERIES_STDIN = """option --queries=- cannot be used when reading \
+from stdin"""
+ERROR_HYBRID = """option --hybrid cannot be used together with options \
+--approximation, --meta=simple or --queries"""
+ERROR_INITIAL_MODEL = """option --initial-model cannot be used together \
+with options --approximation, --meta=simple or --queries"""
+ERROR_RETIRE = """option --retire can only be used with the basic solving method, \
+and not together with options --ground-once, --improve-limit, --on-opt-heur, \
+--no-opt-improving, --preference-unsat, --lns, --hybrid or --decompose"""
+ERROR_CHECKPOINT = """option --checkpoint cannot be used together with options \
+--approximation, --meta=simple or --queries"""
+ERROR_RESUME = "option --resume can only be used together with option --checkpoint"
+ERROR_IMPROVE_BATCH = """option --improve-batch can only be used \
+together with option --improve-limit"""
+ERROR_DOMINANCE_ARCHIVE = """option --dominance-archive cannot be used together \
+with options --approximation, --meta=simple, --queries, --improve-limit, \
+--hybrid, --initial-model, --volatile-optimal or --no-opt-improving"""
+ERROR_RESTART = """option --{} can only be used with the basic solving method, \
+and not together with options --ground-once, --improve-limit, --on-opt-heur, \
+--no-opt-improving, --preference-unsat, --retire, --checkpoint or \
+--dominance-archive"""
+ERROR_UPDATES_STDIN = """option --updates cannot be used when reading \
+from stdin"""
+ERROR_LNS = """option --lns cannot be used together with options \
+--approximation, --meta=simple, --queries, --improve-limit or \
+--dominance-archive"""
+ERROR_DECOMPOSE = """option --decompose can only be used with the basic \
+solving method, and not together with options \
+--queries, --updates, --variants, --checkpoint or --optimize"""
+ERROR_DECOMPOSE_STDIN = """option --decompose cannot be used when reading \
+from stdin"""
+ERROR_OPTIMIZE_VARIANTS = """options --optimize and --variants cannot be \
+used together"""
+ERROR_IMPROVE_SCHEDULE = """option --improve-schedule can only be used \
+together with option --improve-limit"""
 DEBUG          = "--debug"
 TEST           = "--test"
+SERVER         = "--server"
+BATCH          = "--batch"
 ALL_CONFIGS    = ["tweety", "trendy", "frumpy", "crafty", "jumpy", "handy"]
 HELP_PROJECT   = """R|: Enable projective solution enumeration,
   projecting on the formulas of the specification"""
@@ -82,7 +126,9 @@ HELP_DELETE_BETTER = """R|: After computing an optimal model,
   add a program to delete models better than that one"""
 HELP_TOTAL_ORDER = """R|: Do not add programs for optimal models after the \
 first one
-  Use only if the preference specification represents a total order"""
+  Use only if the preference specification represents a total order
+  (set by default for types clingo_minimize, less|more(cardinality|weight)
+  and lexico)"""
 HELP_GROUND_ONCE = """R|: Ground preference program only once \
 (for improving a model)"""
 HELP_CLINGO_HELP = ": Print {1=basic|2=more|3=full} clingo help and exit"
@@ -97,6 +143,19 @@ for optimal models"""
 HELP_TRANS_EXT = """R|: Configure handling of extended rules \
 for non base programs
   (<m> should be as in clingo --trans-ext option)"""
+HELP_AUTO = """R|: Select the solving method from the preference specification:
+  * only types clingo_minimize, less|more(cardinality|weight) and lexico:
+    clingo optimization with --total-order (as without --auto)
+  * only types subset and superset: --approximation=heuristic
+  * unstratified preference program and many models: --meta=combine
+  * many models and at most """ + str(solver.AUTO_GROUND_ONCE) + """ formulas: --ground-once
+  * otherwise: the basic solving method
+  Options --approximation, --meta, --improve-limit, --hybrid, --initial-model
+  and --preference-unsat disable the selection
+  With option --stats, the selected methods are printed"""
+HELP_NO_NATIVE = """R|: Do not use clingo optimization for specifications with types
+  clingo_minimize, less(cardinality), more(cardinality), less(weight),
+  more(weight) and lexico"""
 HELP_PREFERENCE_UNSAT = """R|: Use """ + utils.UNSATP + """ programs \
 for checking that a model is not worse than previous optimal models"""
 HELP_CONST_NONBASE = """R|: Replace term occurrences of <id> in non-base
@@ -113,6 +172,74 @@ optimal"""
 # quick projects and is complete, but does not reprint the unknown models
 # at the end, while nocheck projects and never checks if the unknown models are
 # optimal,  hence it is not complete
+HELP_IMPROVE_SCHEDULE = """R|: Set the conflict limits of option --improve-limit, where <s> can be:
+  * fixed: <m> times the conflicts (default)
+  * geometric[,<r>]: multiply the limit by <r> (default 2) after every \
+limit reached
+  * luby: multiply the limit of the i-th improving step by luby(i)
+  * adaptive: learn the limit from the conflicts of the successful \
+improving steps, times <m>
+  With option --stats, the limits and outcomes of all improving steps \
+are printed"""
+HELP_HYBRID = """R|: Run weak approximation mode with limit <l>, and improve
+  its best model in the basic solving mode,
+  where <l> is either <n> (conflicts) or <n>s (seconds)"""
+HELP_INITIAL_MODEL = """R|: Start improving the model in file <f>
+  <f> contains facts or atoms separated by spaces, either shown atoms
+  or atoms holds(X) for the formulas X of the preference specification
+  Add ',heur' to apply sign heuristics towards that model"""
+HELP_RETIRE = """R|: Bound memory when computing many models:
+  release the programs of the models that have been improved,
+  clean up the ground program every <c> steps, and if <r> is given,
+  rebuild the ground program when it has more than <r> rules
+  keeping only the programs for the optimal models
+  (implies --release-last)"""
+HELP_CHECKPOINT = """R|: Write the optimal models to file <f> (as JSON lines)
+  at most every <s> seconds (default: 0)"""
+HELP_RESUME = """R|: Resume from the optimal models of the file of --checkpoint
+  without recomputing them"""
+HELP_IMPROVE_BATCH = """R|: With option --improve-limit, check whether the models found
+  with the search limit are optimal every <k> steps (default: 1)"""
+HELP_DOMINANCE_ARCHIVE = """R|: Check the models against the optimal models in Python,
+  and add the programs for optimal models only when they are needed
+  (only for types subset, superset, less|more(cardinality|weight),
+  pareto, lexico and and)"""
+HELP_UPDATES = """R|: After optimizing, read updates from stdin and optimize again
+  starting from the last optimal model, where every line is either
+  * assign <a> true|false or release <a> for an external atom <a>
+  * add <p> for grounding a program <p> with new rules
+  * solve or exit
+  (implies --volatile-optimal and --release-last)"""
+HELP_VARIANTS = """R|: Optimize every #optimize statement in turn (sorted by name),
+  sharing the ground base program, and starting from the last optimal model
+  (implies --volatile-optimal and --release-last)"""
+HELP_DECOMPOSE = """R|: If the preference specification optimizes a pareto or and preference
+  whose preferences have disjoint formulas, optimize each of them with
+  <w> worker processes (default: one per preference) and combine the models,
+  solving the specification as a whole if they do not combine into a model,
+  and computing other models starting from the combined one
+  (use --decompose=<w>)"""
+HELP_OPTIMIZE = """R|: Optimize the preference statement named <t>
+  instead of the ones of the #optimize statements"""
+HELP_TRACE = """R|: Write a line to <f> for every model with the time, the number
+  of the model, the step, whether it is optimal, and the quality of every
+  preference statement (as JSON lines if <f> ends with .json, otherwise as CSV)"""
+HELP_LNS = """R|: Improve every model in neighborhoods of it, fixing a fraction <f>
+  of the atoms to their values in that model, with a budget of <c> conflicts
+  (default: """ + str(lns.CONFLICTS) + """), where <s> selects the atoms to fix:
+  * holds: the formulas of the preference specification
+  * shown: the shown atoms
+  * auto: the strategy with the best success rate (default)
+  The fraction decreases when there is no better model in a neighborhood,
+  and increases when the budget is reached;
+  optimality is proven only without neighborhood"""
+HELP_SERVER = """R|: Run as a server with <w> worker processes (default: 1)
+  reading JSON-RPC requests from stdin and writing models to stdout
+  (see src/main/server.py)"""
+HELP_BATCH = """R|: Solve the instances in <d> with <w> worker processes (default: 1)
+  where <d> is a directory or a file with one instance file per line,
+  the other files are parsed once and shared by all instances,
+  and the results are written as JSON lines (see src/main/batch.py)"""
 HELP_CONFIGS = """R|: Run clingo configurations c1, ..., cn iteratively
   (use 'all' for running all configurations)"""
 HELP_NO_META = """R|: Do not use meta-programming solving methods
@@ -127,6 +254,12 @@ HELP_META     = """R|: Apply or disable meta-programming solving methods, where
         this may be incorrect for computing many models using nonstratified preference programs
   Add ',bin' to use a clingo binary for reification
   Add ',sat' to use a clingo binary and systems lp2normal2 and lp2sat for reification"""
+HELP_QUERIES = """R|: Read queries from file <f> (or stdin if <f> is '-'), one per line,
+  and compute for each the optimal models that contain its literals
+  Queries are literals 'a' or 'not a' separated by commas,
+  solved under assumptions using option --meta=simple"""
+HELP_META_CACHE = """R|: Store the reified preference programs of meta-programming
+  solving methods in directory <d>, and reuse them in later runs"""
 
 #
 # VERSION
@@ -258,6 +391,26 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         except Exception as e:
             self.__cmd_parser.error(str(e))
 
+    def __do_improve_schedule(self, string):
+        if string is None:
+            return schedule.FIXED, None
+        try:
+            match = re.match(
+                r'(fixed|geometric|luby|adaptive)(,\d+(\.\d*)?)?$', string
+            )
+            if not match:
+                raise Exception("incorrect value for option --improve-schedule")
+            parameter = None
+            if match.group(2) is not None:
+                if match.group(1) != schedule.GEOMETRIC:
+                    raise Exception(
+                        "incorrect value for option --improve-schedule"
+                    )
+                parameter = float(match.group(2)[1:])
+            return match.group(1), parameter
+        except Exception as e:
+            self.__cmd_parser.error(str(e))
+
     def __do_on_opt_heur(self, on_opt_heur):
         out = []
         try:
@@ -332,6 +485,10 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         #                   help=argparse.SUPPRESS)
         basic.add_argument(TEST, dest='test', action='store_true',
                            help=': Run system tests')
+        basic.add_argument(SERVER, dest='server', nargs='?', const='1',
+                           metavar='<w>', help=HELP_SERVER)
+        basic.add_argument(BATCH, dest='batch', metavar='<d>[,<w>]',
+                           help=HELP_BATCH)
         basic.add_argument('--stats', dest='stats', action='store_true',
                            help=': Print statistics')
         basic.add_argument('--stats-after-solving', dest='stats_after_solving', action='store_true',
@@ -377,6 +534,11 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
                              help=""": Run {weak|heuristic} \
                                        approximation mode""",
                              choices=["weak", "heuristic"])
+        solving.add_argument('--hybrid', dest='hybrid',
+                             metavar="<l>", help=HELP_HYBRID, default=None)
+        solving.add_argument('--initial-model', dest='initial_model',
+                             metavar="<f>", help=HELP_INITIAL_MODEL,
+                             default=None)
         solving.add_argument('--dom-heur', dest='cmd_heuristic',
                               nargs=2, metavar=('<v>','<m>'),
                               help=HELP_HEURISTIC)
@@ -388,6 +550,10 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
                               help=HELP_CONFIGS)
         solving.add_argument('--meta ', dest='meta', help=HELP_META,
                              type=str, metavar='<m>', default=None)
+        solving.add_argument('--queries', dest='queries',
+                             help=HELP_QUERIES, metavar='<f>', default=None)
+        solving.add_argument('--meta-cache', dest='meta_cache',
+                             help=HELP_META_CACHE, metavar='<d>', default=None)
         solving.add_argument('--preference-unsat', dest='preference_unsat',
                              #help=argparse.SUPPRESS,
                              help=HELP_PREFERENCE_UNSAT,
@@ -395,6 +561,34 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         solving.add_argument('--improve-limit',
                              metavar='<m>', dest='improve_limit',
                              help=HELP_IMPROVE_LIMIT)
+        solving.add_argument('--improve-schedule',
+                             metavar='<s>', dest='improve_schedule',
+                             help=HELP_IMPROVE_SCHEDULE, default=None)
+        solving.add_argument('--improve-batch', type=int,
+                             metavar='<k>', dest='improve_batch',
+                             help=HELP_IMPROVE_BATCH, default=None)
+        solving.add_argument('--retire', dest='retire', metavar='<c>[,<r>]',
+                             help=HELP_RETIRE, default=None)
+        solving.add_argument('--checkpoint', dest='checkpoint',
+                             metavar='<f>[,<s>]', help=HELP_CHECKPOINT,
+                             default=None)
+        solving.add_argument('--resume', dest='resume',
+                             help=HELP_RESUME, action='store_true')
+        solving.add_argument('--dominance-archive', dest='dominance_archive',
+                             help=HELP_DOMINANCE_ARCHIVE, action='store_true')
+        solving.add_argument('--decompose', dest='decompose', nargs='?',
+                             const='0', metavar='<w>', help=HELP_DECOMPOSE,
+                             default=None)
+        solving.add_argument('--optimize', dest='optimize', metavar='<t>',
+                             help=HELP_OPTIMIZE, default=None)
+        solving.add_argument('--trace', dest='trace', metavar='<f>',
+                             help=HELP_TRACE, default=None)
+        solving.add_argument('--lns', dest='lns', metavar='<f>[,<c>][,<s>]',
+                             help=HELP_LNS, default=None)
+        solving.add_argument('--updates', dest='updates',
+                             help=HELP_UPDATES, action='store_true')
+        solving.add_argument('--variants', dest='variants',
+                             help=HELP_VARIANTS, action='store_true')
 
         # Additional Solving Options
         solving = cmd_parser.add_argument_group('Additional Solving Options')
@@ -425,11 +619,16 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         solving.add_argument('--volatile-optimal', dest='volatile_optimal',
                              help=HELP_VOLATILE_OPTIMAL,
                              action='store_true')
+        solving.add_argument('--auto', dest='auto',
+                             help=HELP_AUTO, action='store_true')
+        solving.add_argument('--no-native', dest='native',
+                             help=HELP_NO_NATIVE, action='store_false')
         solving.add_argument('--pref-trans-ext', dest='trans_ext',
                              help=HELP_TRANS_EXT, metavar="<m>", default=None)
 
         options, unknown = cmd_parser.parse_known_args(args=args)
         options = vars(options)
+        options['args'] = list(args) # for --decompose
 
         # checks
         # if 'improve_limit' in options and options['stats']:
@@ -474,6 +673,24 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
             options['project'] = True
         options['improve_limit'] = option
 
+        # handle improve_schedule
+        if options['improve_schedule'] is not None and option is None:
+            self.__cmd_parser.error(ERROR_IMPROVE_SCHEDULE)
+        options['improve_schedule'] = self.__do_improve_schedule(
+            options['improve_schedule']
+        )
+
+        # handle improve_batch
+        if options['improve_batch'] is not None:
+            if option is None:
+                self.__cmd_parser.error(ERROR_IMPROVE_BATCH)
+            if options['improve_batch'] < 1:
+                self.__cmd_parser.error(
+                    "incorrect value for option --improve-batch"
+                )
+        else:
+            options['improve_batch'] = 1
+
         # handle configs all
         if options['configs'] and 'all' in options['configs']:
             options['configs'] = ALL_CONFIGS
@@ -498,6 +715,131 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
         options['meta_binary'] = binary
         options['meta_sat'] = sat
 
+        # handle hybrid
+        if options['hybrid'] is not None:
+            match = re.match(r'(\d+)(s)?$', options['hybrid'])
+            if not match:
+                self.__cmd_parser.error("incorrect value for option --hybrid")
+            if options['solving_mode'] != 'normal' or meta == META_SIMPLE \
+               or options['queries'] is not None:
+                self.__cmd_parser.error(ERROR_HYBRID)
+            options['hybrid'] = (int(match.group(1)), bool(match.group(2)))
+
+        # handle initial_model
+        if options['initial_model'] is not None:
+            match = re.match(r'(.+?)(,heur)?$', options['initial_model'])
+            if options['solving_mode'] != 'normal' or \
+               options['meta'] == META_SIMPLE or \
+               options['queries'] is not None:
+                self.__cmd_parser.error(ERROR_INITIAL_MODEL)
+            options['initial_model'] = (match.group(1), bool(match.group(2)))
+
+        # handle retire
+        if options['retire'] is not None:
+            match = re.match(r'([1-9][0-9]*)(,([1-9][0-9]*))?$',
+                             options['retire'])
+            if not match:
+                self.__cmd_parser.error("incorrect value for option --retire")
+            if options['solving_mode'] != 'normal' or \
+               meta not in [META_OPEN, META_NO] or \
+               options['ground_once'] or options['improve_limit'] or \
+               options['on_opt_heur'] or options['no_opt_improving'] or \
+               options['preference_unsat'] or options['queries'] is not None or \
+               options['lns'] is not None or options['hybrid'] is not None or \
+               options['decompose'] is not None:
+                self.__cmd_parser.error(ERROR_RETIRE)
+            rules = int(match.group(3)) if match.group(3) else None
+            options['retire'] = (int(match.group(1)), rules)
+            options['release_last'] = True
+
+        # handle checkpoint and resume
+        if options['checkpoint'] is not None:
+            match = re.match(r'(.+?)(,(\d+(\.\d+)?))?$', options['checkpoint'])
+            if options['solving_mode'] != 'normal' or meta == META_SIMPLE or \
+               options['queries'] is not None:
+                self.__cmd_parser.error(ERROR_CHECKPOINT)
+            seconds = float(match.group(3)) if match.group(3) else 0
+            options['checkpoint'] = (match.group(1), seconds)
+        elif options['resume']:
+            self.__cmd_parser.error(ERROR_RESUME)
+
+        # handle dominance archive
+        if options['dominance_archive']:
+            if options['solving_mode'] != 'normal' or meta == META_SIMPLE or \
+               options['queries'] is not None or options['improve_limit'] or \
+               options['hybrid'] is not None or \
+               options['initial_model'] is not None or \
+               options['volatile_optimal'] or options['no_opt_improving']:
+                self.__cmd_parser.error(ERROR_DOMINANCE_ARCHIVE)
+
+        # handle lns
+        if options['lns'] is not None:
+            match = re.match(
+                r'(0?\.[0-9]+)(,([0-9]+))?(,(holds|shown|auto))?$',
+                options['lns']
+            )
+            if not match or not 0 < float(match.group(1)) < 1:
+                self.__cmd_parser.error("incorrect value for option --lns")
+            if options['solving_mode'] != 'normal' or meta == META_SIMPLE or \
+               options['queries'] is not None or options['improve_limit'] or \
+               options['dominance_archive']:
+                self.__cmd_parser.error(ERROR_LNS)
+            conflicts = int(match.group(3)) if match.group(3) else \
+                        lns.CONFLICTS
+            strategy = match.group(5) if match.group(5) else lns.AUTO
+            options['lns'] = (float(match.group(1)), conflicts, strategy)
+
+        # handle optimize
+        if options['optimize'] is not None and options['variants']:
+            self.__cmd_parser.error(ERROR_OPTIMIZE_VARIANTS)
+
+        # handle decompose
+        if options['decompose'] is not None:
+            if not re.match(r'[0-9]+$', options['decompose']):
+                self.__cmd_parser.error(
+                    "incorrect value for option --decompose"
+                )
+            if options['solving_mode'] != 'normal' or meta == META_SIMPLE or \
+               options['queries'] is not None or options['updates'] or \
+               options['variants'] or options['checkpoint'] is not None or \
+               options['optimize'] is not None:
+                self.__cmd_parser.error(ERROR_DECOMPOSE)
+            if "-" in [i[0] for i in options['files']]:
+                self.__cmd_parser.error(ERROR_DECOMPOSE_STDIN)
+            options['decompose'] = int(options['decompose'])
+
+        # handle updates and variants
+        for option in ['updates', 'variants']:
+            if not options[option]:
+                continue
+            if options['solving_mode'] != 'normal' or meta != META_OPEN or \
+               options['ground_once'] or options['improve_limit'] or \
+               options['on_opt_heur'] or options['no_opt_improving'] or \
+               options['preference_unsat'] or \
+               options['queries'] is not None or \
+               options['retire'] is not None or \
+               options['checkpoint'] is not None or \
+               options['dominance_archive']:
+                self.__cmd_parser.error(ERROR_RESTART.format(option))
+            options['volatile_optimal'] = True
+            options['release_last'] = True
+        if options['updates'] and "-" in [i[0] for i in options['files']]:
+            self.__cmd_parser.error(ERROR_UPDATES_STDIN)
+
+        # handle queries
+        if options['queries'] is not None:
+            if meta not in [META_OPEN, META_SIMPLE] or query:
+                self.__cmd_parser.error(ERROR_QUERIES_META)
+            if options['on_opt_heur']:
+                self.__cmd_parser.error(ERROR_QUERIES_ON_OPT_HEUR)
+            if options['queries'] == "-" and \
+               "-" in [i[0] for i in options['files']]:
+                self.__cmd_parser.error(ERROR_QUERIES_STDIN)
+            options['meta'] = META_SIMPLE
+
+        # handle auto
+        options['auto_choices'] = []
+
         # statistics
         # if options['stats']:
         clingo_options.append('--stats')
@@ -513,9 +855,14 @@ License: The MIT License <https://opensource.org/licenses/MIT>"""
 #
 class Asprin:
 
-    def __init__(self):
+    # listener is used by the library API (see api.py), and
+    # spec_cache is a dictionary for the parsed specifications (see server.py)
+    def __init__(self, listener=None, handle_signals=True, spec_cache=None):
         self.control = None
         self.options = None
+        self.listener = listener
+        self.handle_signals = handle_signals
+        self.spec_cache = spec_cache
 
     def __update_constants(self, options, constants):
         for i in constants:
@@ -528,6 +875,42 @@ class Asprin:
         except Exception as e:
             raise argparse.ArgumentError(None, e.message)
 
+    # returns a function that creates a new Control object
+    # with the base and the preference programs
+    def __get_control_factory(self, clingo_options, programs):
+        programs, options = copy.deepcopy(programs), copy.deepcopy(self.options)
+        def factory():
+            control = self.__get_control(clingo_options)
+            for i in options["to_clingo"]:
+                control.load(i)
+            _program_parser = program_parser.Parser(
+                control, copy.deepcopy(programs), copy.deepcopy(options), None
+            )
+            _program_parser.parse()
+            return control
+        return factory
+
+    # included files are not part of the key
+    def __get_spec_key(self, underscores):
+        if self.spec_cache is None:
+            return None
+        files = [i[0] for i in self.options['files']]
+        if "-" in files:
+            return None
+        files = tuple([(i, os.path.getmtime(i)) for i in files])
+        return (underscores, files, self.options['asprin-lib'],
+                self.options['variants'], self.options['optimize'])
+
+    def __parse_spec(self, underscores):
+        key = self.__get_spec_key(underscores)
+        if key is not None and key in self.spec_cache:
+            return copy.deepcopy(self.spec_cache[key])
+        sp = spec_parser.Parser(underscores, self.options)
+        out = sp.parse_files()
+        if key is not None:
+            self.spec_cache[key] = copy.deepcopy(out)
+        return out
+
     def __signal_on_not_solved(self):
         printer.Printer().print_stats(self.control, 0, True, 0,
                                       self.options['non_optimal'],
@@ -558,12 +941,14 @@ class Asprin:
         # signal handler
         control_proxy = clingo_signal_handler.ClingoSignalHandler(
             self.control, "asprin",
-            print_after_solving=self.options['stats_after_solving'],
-            function_on_not_solved=self.__signal_on_not_solved
+            print_after_solving=self.options['stats_after_solving'] and \
+                                not printer.Printer().silent,
+            function_on_not_solved=self.__signal_on_not_solved,
+            handle_signals=self.handle_signals
         )
 
         # print prologue and warnings
-        print(prologue)
+        printer.Printer().do_print(prologue)
         for i in warnings:
             printer.Printer().warning_included_file(i)
 
@@ -572,15 +957,19 @@ class Asprin:
             self.control.load(i)
 
         # specification parsing
-        sp = spec_parser.Parser(u, self.options)
         programs, utils.underscores, base_constants, self.options['show'] = \
-                                                     sp.parse_files()
+                                                     self.__parse_spec(u)
         self.__update_constants(self.options, base_constants)
-        del sp
 
-        # observer
+        # observer (with --auto, for using --meta=combine if needed)
         observer = None
-        if self.options['meta'] in [META_SIMPLE, META_COMBINE]:
+        auto_meta = self.options['auto'] and \
+                    self.options['meta'] == META_OPEN and \
+                    self.options['max_models'] != 1 and \
+                    self.options['retire'] is None and \
+                    not self.options['updates'] and \
+                    not self.options['variants']
+        if self.options['meta'] in [META_SIMPLE, META_COMBINE] or auto_meta:
             if not self.options['meta_binary'] and not self.options['meta_sat']:
                 observer = metasp.Observer(
                     self.control,
@@ -597,6 +986,14 @@ class Asprin:
                     bool_add_constants_nb = True
                 )
 
+        # control factory (with --retire=<c>,<r>, for rebuilding the program)
+        control_factory = None
+        if self.options['retire'] is not None and \
+           self.options['retire'][1] is not None:
+            control_factory = self.__get_control_factory(
+                clingo_options, programs
+            )
+
         # preference programs parsing
         _program_parser = program_parser.Parser(
             self.control, programs, self.options, observer
@@ -608,6 +1005,10 @@ class Asprin:
         _solver = solver.Solver(
             self.control, self.options, control_proxy, observer
         )
+        _solver.control_factory = control_factory
+        if self.listener is not None:
+            _solver.listener = self.listener
+            self.listener.set_solver(_solver)
         control_proxy.function_on_solving = _solver.signal_on_solving
         control_proxy.function_on_not_solving = _solver.signal_on_not_solving
         control_proxy.function_after_solving = _solver.signal_after_solving
@@ -650,6 +1051,12 @@ def main(args):
         args.remove(TEST)
         from ..tests import tester
         tester.main(args)
+    elif [i for i in args if i == SERVER or i.startswith(SERVER + "=")]:
+        from . import server
+        server.main(args)
+    elif [i for i in args if i.startswith(BATCH + "=")]:
+        from . import batch
+        batch.main(args)
     elif DEBUG in args:
         Asprin().run_wild(args)
     else:
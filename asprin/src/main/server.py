@@ -0,0 +1,191 @@
+# MIT License
+#
+# Copyright (c) 2017 Javier Romero
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#
+# Server
+#
+# Reads JSON-RPC 2.0 requests from stdin, one per line, for example:
+#   {"jsonrpc": "2.0", "id": 1, "method": "solve",
+#    "params": {"inputs": ["encoding.lp", "instance.lp"], "options": "0"}}
+#   {"jsonrpc": "2.0", "method": "exit"}
+# and writes to stdout, one per line, a notification for every model:
+#   {"jsonrpc": "2.0", "method": "model",
+#    "params": {"id": 1, "number": 1, "optimal": true, "shown": ["a"],
+#               "holds": ["a"], "stats": {"step": 1, "time": 0.01}}}
+# and a response for every request:
+#   {"jsonrpc": "2.0", "id": 1, "result": {"models": 1, "optimal": 1}}
+#
+# Jobs are solved by a pool of worker processes that keep clingo and the
+# parser tables loaded, and cache the parsed specifications.
+# Only the specification parsing is cached: the base program is grounded and
+# the preference programs are translated again for every job, because
+# the translation depends on the ground base program of the job.
+# The options given to the server are added to the options of every job.
+# To use a Unix socket, the server can be run with socat, for example:
+#   socat UNIX-LISTEN:asprin.sock,fork EXEC:"asprin --server=4"
+#
+
+from __future__ import print_function
+import sys
+import json
+import shlex
+import threading
+import multiprocessing
+from . import api
+
+
+#
+# DEFINES
+#
+
+SERVER = "--server"
+JSONRPC = "2.0"
+SOLVE = "solve"
+EXIT = "exit"
+MODEL = "model"
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SOLVING_ERROR = -32000
+ERROR_WORKERS = "incorrect value for option --server: {}"
+
+# in the worker processes
+EVENTS = None
+CACHE = None
+
+
+#
+# messages
+#
+
+def response(_id, result):
+    return {"jsonrpc": JSONRPC, "id": _id, "result": result}
+
+def error(_id, code, message):
+    return {"jsonrpc": JSONRPC, "id": _id,
+            "error": {"code": code, "message": message}}
+
+def model_notification(_id, model):
+    params = model.to_dict()
+    params["id"] = _id
+    return {"jsonrpc": JSONRPC, "method": MODEL, "params": params}
+
+
+#
+# worker processes
+#
+
+def init_worker(events):
+    global EVENTS, CACHE
+    EVENTS, CACHE = events, {}
+
+def solve_job(_id, inputs, options):
+    models, optimal = 0, 0
+    try:
+        for model in api.solve(inputs, options, CACHE):
+            models += 1
+            optimal += 1 if model.optimal else 0
+            EVENTS.put(model_notification(_id, model))
+        EVENTS.put(response(_id, {"models": models, "optimal": optimal}))
+    except Exception as e:
+        EVENTS.put(error(_id, SOLVING_ERROR, str(e)))
+
+
+#
+# server
+#
+
+class Server:
+
+    def __init__(self, workers, options):
+        self.options = options
+        self.events  = multiprocessing.Queue()
+        self.pool    = multiprocessing.Pool(
+            workers, init_worker, (self.events,)
+        )
+
+    def write(self):
+        while True:
+            message = self.events.get()
+            if message is None:
+                break
+            sys.stdout.write(json.dumps(message) + "\n")
+            sys.stdout.flush()
+
+    # returns False on exit
+    def handle(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            self.events.put(error(None, PARSE_ERROR, str(e)))
+            return True
+        if not isinstance(request, dict) or "method" not in request:
+            self.events.put(error(None, INVALID_REQUEST, "invalid request"))
+            return True
+        _id, method = request.get("id"), request["method"]
+        params = request.get("params", {})
+        if method == EXIT:
+            return False
+        if method != SOLVE:
+            self.events.put(error(_id, METHOD_NOT_FOUND, method))
+            return True
+        try:
+            inputs, options = params["inputs"], params.get("options", [])
+            if not isinstance(options, list):
+                options = shlex.split(options)
+        except (KeyError, TypeError, AttributeError, ValueError):
+            self.events.put(error(_id, INVALID_PARAMS, "invalid params"))
+            return True
+        self.pool.apply_async(solve_job, (_id, inputs, self.options + options))
+        return True
+
+    def run(self):
+        writer = threading.Thread(target=self.write)
+        writer.start()
+        for line in iter(sys.stdin.readline, ""):
+            if line.strip() and not self.handle(line):
+                break
+        # wait for the jobs
+        self.pool.close()
+        self.pool.join()
+        self.events.put(None)
+        writer.join()
+
+
+def main(args):
+    workers, options = 1, []
+    for i in args:
+        if i == SERVER:
+            continue
+        elif i.startswith(SERVER + "="):
+            try:
+                workers = int(i[len(SERVER + "="):])
+                if workers < 1:
+                    raise ValueError
+            except ValueError:
+                print(ERROR_WORKERS.format(i), file=sys.stderr)
+                sys.exit(1)
+        else:
+            options.append(i)
+    Server(workers, options).run()
@@ -34,6 +34,9 @@ from ..program_parser import visitor
 # predicates
 HOLDS      = utils.HOLDS
 HOLDSP     = utils.HOLDSP
+CURRENT    = utils.CURRENT
+CURRENTP   = utils.CURRENTP
+HOLDS_AT_ZERO = utils.HOLDS_AT_ZERO
 PREFERENCE = utils.PREFERENCE
 OPTIMIZE   = utils.OPTIMIZE
 
@@ -47,6 +50,7 @@ UNSTRAT_NAME = "unstrat"
 M1 = visitor.M1
 M2 = visitor.M2
 M1_M2 = visitor.M1_M2
+ZERO  = visitor.ZERO
 
 # errors
 ERROR_PROJECT    = utils.ERROR_PROJECT
@@ -83,8 +87,17 @@ class PreferenceTermTransformer(visitor.TermTransformer):
         # HOLDS and HOLDS' appear always in open, and should be always overriden
         self.predicates_info[(HOLDS, 1)]  = PredicateInfo(None, 0, M1, 1)
         self.predicates_info[(HOLDSP, 1)] = PredicateInfo(HOLDS, 0, M2, 1)
-        info = PredicateInfo(None, 0, None, 0)
-        for i in [(OPTIMIZE, 1), (PREFERENCE, 2), (PREFERENCE, 5)]:
+        # holds_at_zero refers to the model being searched, and
+        # current['] hold if holds['] refer to it
+        reserved = [
+            ((OPTIMIZE, 1),      PredicateInfo(None,  0, None,  0)),
+            ((PREFERENCE, 2),    PredicateInfo(None,  0, None,  0)),
+            ((PREFERENCE, 5),    PredicateInfo(None,  0, None,  0)),
+            ((HOLDS_AT_ZERO, 1), PredicateInfo(HOLDS, 0, ZERO,  1)),
+            ((CURRENT, 0),       PredicateInfo(None,  0, M1_M2, 2)),
+            ((CURRENTP, 0),      PredicateInfo(None,  0, M1_M2, 2)),
+        ]
+        for i, info in reserved:
             if i in self.predicates_info:
                 string = ERROR_KEYWORD.format(self.__type, i[0], i[1])
                 visitor.Helper().raise_exception(string)
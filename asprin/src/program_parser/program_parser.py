@@ -57,6 +57,7 @@ GEN_DOM    = utils.GEN_DOM
 PREFERENCE = utils.PREFERENCE
 SHOW       = utils.SHOW
 OPTIMIZE   = utils.OPTIMIZE
+VARIANT    = utils.VARIANT
 ERROR_PRED = utils.ERROR_PRED
 WARN_PRED  = utils.WARN_PRED
 
@@ -102,6 +103,18 @@ CHECK_SPEC = """
   C = ": error: preference specification error, ", 
   D = "optimizing non existent preference statement".
 
+% avoid clingo warnings
+#defined ##preference/5.
+#defined ##preference/2.
+#defined ##optimize/1.
+#defined ##unsat/2.
+#defined ##false/0.
+#defined ##optimize/1.
+#defined ##holds/2.
+"""
+
+# error checking of the optimize statements (not with --variants)
+CHECK_OPTIMIZE = """
 % many optimize statements
 ##error((A,B,C,D)):- ##optimize(X), 2 { ##optimize(Y) }, 
   A = "optimize:", 
@@ -117,15 +130,6 @@ CHECK_SPEC = """
 ##warning((A,B)):- { ##optimize(Y) } 0, 
   A = "WARNING: no optimize statement, ",
   B = "computing non optimal stable models".
-
-% avoid clingo warnings
-#defined ##preference/5.
-#defined ##preference/2.
-#defined ##optimize/1.
-#defined ##unsat/2.
-#defined ##false/0.
-#defined ##optimize/1.
-#defined ##holds/2.
 """
 
 # error printing
@@ -148,6 +152,21 @@ parsing error, unstratified {} program, use option --meta"""
 # for meta-programming
 META_COMBINE = utils.META_COMBINE
 META_OPEN = utils.META_OPEN
+META_NO = utils.META_NO
+
+# for the native fast path:
+# types whose weak approximation programs are exact total preorders
+NATIVE_TYPES = set([
+    "clingo_minimize", "less(cardinality)", "more(cardinality)",
+    "less(weight)", "more(weight)", "lexico"
+])
+
+# types that are total preorders (also if combined with lexico)
+TOTAL_TYPES = NATIVE_TYPES
+
+# for --auto:
+# types whose heuristic approximation programs compute optimal models
+HEURISTIC_TYPES = set(["subset", "superset"])
 
 class BuilderProxy:
 
@@ -256,7 +275,8 @@ class Parser:
         programs = [(PREFERENCE, ERROR_NO_PREF_PROGRAM)]
         if self.__options['solving_mode'] == 'heuristic':
             programs.append((HEURISTIC, ERROR_NO_HEURISTIC_PROGRAM))
-        elif self.__options['solving_mode'] == 'weak':
+        elif self.__options['solving_mode'] == 'weak' or \
+             self.__options['hybrid'] is not None:
             programs.append((APPROX, ERROR_NO_APPROX_PROGRAM))
         if self.__options['preference_unsat']:
             programs.append((UNSATP, ERROR_NO_UNSATP_PROGRAM))
@@ -283,6 +303,8 @@ class Parser:
         string  = programs[SPEC][""].get_string() 
         if options['check']:
             string += CHECK_SPEC.replace("##",u)
+            if not options['variants']:
+                string += CHECK_OPTIMIZE.replace("##",u)
         self.__add_and_ground(SPEC,old,string,[(SPEC,new)])
 
         pr = printer.Printer()
@@ -298,7 +320,8 @@ class Parser:
                 pr.print_spec_error(string)
                 errors = True
             # get non domain errors
-            for i in [(PREFERENCE,2),(PREFERENCE,5),(OPTIMIZE,1)]:
+            optimize = (VARIANT,1) if options['variants'] else (OPTIMIZE,1)
+            for i in [(PREFERENCE,2),(PREFERENCE,5),optimize]:
                 ui0 = u + i[0]
                 for atom in control.symbolic_atoms.by_signature(ui0, i[1]):
                     if not atom.is_fact:
@@ -323,8 +346,61 @@ class Parser:
         if errors:
             raise Exception("parsing failed")
 
+        # native fast path: solve with clingo optimization
+        if self.__native(out):
+            options['solving_mode'] = 'weak'
+            options['total_order'] = True
+            options['auto_choices'].append("native")
+        # --auto: solve with domain heuristics
+        elif options['auto'] and self.__heuristic(out):
+            options['solving_mode'] = 'heuristic'
+            options['auto_choices'].append("heuristic")
+        # total preorders: only the first optimal model needs programs
+        if self.__total(out):
+            options['total_order'] = True
+
         return out
 
+    # the other options allow changing the solving mode
+    def __free_mode(self):
+        options = self.__options
+        return options['solving_mode'] == 'normal' and \
+               options['meta'] in [META_OPEN, META_NO] and \
+               options['improve_limit'] is None and \
+               not options['steps'] and \
+               not options['preference_unsat'] and \
+               options['hybrid'] is None and \
+               options['initial_model'] is None and \
+               not options['updates'] and not options['variants'] and \
+               options['lns'] is None and options['decompose'] is None and \
+               not options['ground_once'] and not options['delete_better'] and \
+               not options['release_last'] and \
+               not options['no_opt_improving'] and \
+               not options['volatile_improving'] and \
+               not options['volatile_optimal'] and \
+               options['retire'] is None and \
+               options['checkpoint'] is None and not options['resume'] and \
+               not options['dominance_archive'] and options['trace'] is None and \
+               not options['on_opt_heur'] and not options['project']
+
+    def __native(self, types):
+        return bool(types) and types.issubset(NATIVE_TYPES) and \
+               all([t in self.__programs[APPROX] for t in types]) and \
+               self.__options['native'] and self.__free_mode()
+
+    # with --improve-limit, the models found may be not optimal
+    def __total(self, types):
+        options = self.__options
+        return bool(types) and types.issubset(TOTAL_TYPES) and \
+               options['solving_mode'] == 'normal' and \
+               options['improve_limit'] is None and \
+               not options['preference_unsat']
+
+    def __heuristic(self, types):
+        return bool(types) and types.issubset(HEURISTIC_TYPES) and \
+               all([t in self.__programs[HEURISTIC] for t in types]) and \
+               self.__free_mode()
+
     def add_show(self,types):
 
         # decide if adding #shows to the base, and set 'show_underscores'
@@ -373,7 +449,8 @@ class Parser:
         )
         visitors = [(PREFP, v)]
         # do approximations
-        if self.__options['solving_mode'] == 'weak':
+        if self.__options['solving_mode'] == 'weak' or \
+           self.__options['hybrid'] is not None:
             v = basic.BasicProgramVisitor(
                 builder, APPROX, U_APPROX, constants
             )
@@ -401,6 +478,12 @@ class Parser:
                self.__options['max_models'] != 1 and \
                ((not self.__options['preference_unsat'] and name ==  PREFP) or
                 (    self.__options['preference_unsat'] and name == UNSATP)):
+                # --auto: use --meta=combine (the observer is already set)
+                if self.__options['auto'] and observer_builder and \
+                   not self.__options['preference_unsat']:
+                    self.__options['meta'] = META_COMBINE
+                    self.__options['auto_choices'].append("meta=combine")
+                    continue
                 raise Exception(ERROR_UNSTRAT_PROGRAM.format(name))
 
     def parse(self):
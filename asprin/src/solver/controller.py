@@ -21,7 +21,10 @@
 # SOFTWARE.
 # -*- coding: utf-8 -*-
 
+import time
 from ..utils import utils
+from . import schedule
+from . import lns
 
 class GeneralController:
 
@@ -33,8 +36,6 @@ class GeneralController:
 
     def start(self):
         solver, options = self.solver, self.solver.options
-        if options.trans_ext is not None:
-            solver.control.configuration.asp.trans_ext = options.trans_ext
         # store nholds and set holds domain
         if solver.options.max_models != 1:
             solver.store_nholds = True
@@ -43,13 +44,7 @@ class GeneralController:
         if solver.set_holds_domain:
             solver.do_set_holds_domain()
         #
-        solver.add_encodings()
-        solver.ground_preference_base()
-        # --dom-heur
-        if options.cmd_heuristic is not None:
-            solver.ground_cmd_heuristic()
-            for _solver in solver.control.configuration.solver:
-                _solver.heuristic="Domain"
+        self.ground_base()
         # check syntax
         if options.check:
             solver.check_errors()
@@ -61,6 +56,19 @@ class GeneralController:
             self.solver.solve_single()
             self.solver.end()
 
+    # used also by RetireController
+    def ground_base(self):
+        solver, options = self.solver, self.solver.options
+        if options.trans_ext is not None:
+            solver.control.configuration.asp.trans_ext = options.trans_ext
+        solver.add_encodings()
+        solver.ground_preference_base()
+        # --dom-heur
+        if options.cmd_heuristic is not None:
+            solver.ground_cmd_heuristic()
+            for _solver in solver.control.configuration.solver:
+                _solver.heuristic="Domain"
+
     def sat(self):
         self.solver.models     += 1
         self.solver.last_unsat  = False
@@ -182,6 +190,193 @@ class EnumerationController:
                 self.solver.end()
 
 
+#
+# Warm Start Controller
+#
+
+class WarmStartController:
+
+    def __init__(self, solver):
+        self.solver = solver
+        if solver.options.initial_model is not None:
+            solver.store_nholds = True
+
+    # returns True if there is a first model to improve
+    def start(self):
+        options = self.solver.options
+        if options.initial_model is not None:
+            if self.solver.solve_initial_model():
+                return True
+        if options.hybrid is not None:
+            return self.solver.solve_hybrid()
+        return False
+
+
+#
+# Checkpoint Controller
+#
+
+class CheckpointController:
+
+    def __init__(self, solver, general, optimal):
+        self.solver, self.general, self.optimal = solver, general, optimal
+        self.on = solver.options.checkpoint is not None
+        if self.on:
+            self.file, self.interval = solver.options.checkpoint
+            self.records, self.time, self.opt_models = [], time.time(), 0
+            self.recorded = None
+            solver.store_nholds = True
+
+    def start(self):
+        solver = self.solver
+        if not self.on:
+            return
+        if not solver.options.resume:
+            solver.write_checkpoint(self.file, [], 'w')
+            return
+        # rewrite the file without an incomplete last line
+        records, lines = solver.read_checkpoint(self.file)
+        solver.write_checkpoint(self.file, lines, 'w')
+        if not records:
+            return
+        if self.general.bool_set_unsat_program:
+            solver.set_unsat_program()
+            self.general.bool_set_unsat_program = False
+        for step, holds, shown, models in records:
+            solver.resume_optimal_model(step, holds, shown)
+            self.optimal.unsat()
+            solver.models     += models
+            solver.opt_models += models
+            solver.step = max(solver.step, step + 1)
+        self.opt_models, self.recorded = solver.opt_models, solver.last_model
+        solver.print_resumed(len(records), self.file)
+        if solver.options.max_models != 0 and \
+           solver.opt_models >= solver.options.max_models:
+            solver.end()
+
+    def record(self):
+        models = self.solver.opt_models - self.opt_models
+        self.opt_models = self.solver.opt_models
+        self.recorded = self.solver.last_model
+        self.records.append(self.solver.get_checkpoint_record(models))
+
+    def unsat(self):
+        if not self.on:
+            return
+        self.record()
+        if time.time() - self.time >= self.interval:
+            self.write()
+
+    def write(self):
+        if self.records:
+            self.solver.write_checkpoint(self.file, self.records)
+            self.records, self.time = [], time.time()
+
+    # the last optimal model is not recorded by unsat() if it ended the run
+    def end(self):
+        if not self.on:
+            return
+        solver = self.solver
+        if solver.last_unsat and solver.opt_models > self.opt_models and \
+           solver.last_model != self.recorded:
+            self.record()
+        self.write()
+
+
+#
+# Retire Controller
+#
+
+class RetireController:
+
+    def __init__(self, solver, general, optimal, method):
+        self.solver, self.general, self.optimal = solver, general, optimal
+        self.on = solver.options.retire is not None and \
+                  isinstance(method, GroundManyMethodController)
+        if self.on:
+            self.clean_up, self.rules = solver.options.retire
+            solver.stats_functions.append(solver.retire_stats)
+
+    # rebuild only after an optimal model, when no step is being improved
+    def end_loop(self):
+        solver = self.solver
+        if not self.on:
+            return
+        if self.rules is not None and solver.last_unsat and \
+           solver.control_factory is not None and \
+           solver.get_rules() > self.rules:
+            solver.new_control()
+            self.general.ground_base()
+            self.optimal.start()
+            solver.replay_optimal_models()
+        elif (solver.step - 1) % self.clean_up == 0:
+            solver.clean_up()
+
+
+#
+# Restart Controller
+#
+# With --variants, optimizes every variant in turn,
+# and with --updates, reads the updates and starts again
+#
+
+class RestartController:
+
+    def __init__(self, solver, optimal):
+        self.solver, self.optimal = solver, optimal
+        self.delete_worse  = optimal.delete_worse
+        self.delete_better = optimal.delete_better
+
+    def start(self):
+        if self.solver.options.variants:
+            self.solver.set_variants()
+
+    # returns True if there is a new optimization
+    def restart(self):
+        solver, optimal = self.solver, self.optimal
+        if solver.next_variant():
+            pass
+        elif not solver.options.updates or not solver.read_updates():
+            return False
+        else:
+            solver.first_variant()
+        solver.restart_optimization()
+        optimal.start_step, optimal.first = True, True
+        optimal.delete_worse  = self.delete_worse
+        optimal.delete_better = self.delete_better
+        solver.printer.do_print("Solving...")
+        return True
+
+    # returns True if there is a first model to improve
+    def warm_start(self):
+        return self.solver.solve_previous_optimum()
+
+
+#
+# Decompose Controller
+#
+
+class DecomposeController:
+
+    def __init__(self, solver, general):
+        self.solver, self.general = solver, general
+        if solver.options.decompose is not None:
+            solver.stats_functions.append(solver.decompose_stats)
+
+    # the model is optimal: if max_models is 1, general.unsat() ends,
+    # and otherwise returns True, and the model is the first one to improve
+    def start(self):
+        if self.solver.options.decompose is None:
+            return False
+        if not self.solver.solve_decomposed():
+            return False
+        if self.solver.options.max_models != 1:
+            return True
+        self.general.sat()
+        self.general.unsat()
+        return False
+
+
 #
 # Method Controllers
 #
@@ -301,6 +496,37 @@ class MetaMethodController(MethodController):
         self.solver.end()
 
 
+# the models found are checked against the optimal models of the archive,
+# and if one is worse, its unsat program is grounded and we solve again
+class DominanceController(MethodController):
+
+    def __init__(self, solver, controller):
+        MethodController.__init__(self, solver)
+        self.controller = controller
+
+    def start(self):
+        self.controller.start()
+        self.solver.set_dominance_archive()
+
+    def start_loop(self):
+        self.controller.start_loop()
+
+    def solve(self):
+        solver = self.solver
+        last = solver.holds, solver.nholds, solver.shown
+        while True:
+            self.controller.solve()
+            if solver.solving_result != utils.SATISFIABLE or \
+               not solver.ground_dominated():
+                break
+            solver.holds, solver.nholds, solver.shown = last
+        if solver.solving_result != utils.SATISFIABLE:
+            solver.holds, solver.nholds, solver.shown = last
+
+    def unsat(self):
+        self.controller.unsat()
+
+
 class ImproveLimitController(MethodController):
 
     def __init__(self, solver, controller):
@@ -313,6 +539,11 @@ class ImproveLimitController(MethodController):
         self.search     = 0
         # limits
         self.previous_limit, self.limit = "", 0
+        name, parameter = solver.options.improve_schedule
+        self.schedule = schedule.get_schedule(
+            name, self.option[0], self.option[2], parameter
+        )
+        solver.stats_functions.append(self.schedule.stats)
         # store nholds
         self.solver.store_nholds = True
 
@@ -324,9 +555,7 @@ class ImproveLimitController(MethodController):
         # get previous limit, and set limit
         self.previous_limit = self.conf.solve_limit
         if not self.solver.last_unsat:
-            self.limit = (1 if self.search==0 else self.search) * self.option[0]
-            if self.limit < self.option[2]:
-                self.limit = self.option[2]
+            self.limit = self.schedule.budget(self.search)
             self.conf.solve_limit = str(self.limit) + ",umax"
             if self.limit == 0: # if limit is 0, return
                 return
@@ -335,12 +564,26 @@ class ImproveLimitController(MethodController):
 
     def solve(self):
         # if improving and limit is 0, return unknown
-        if not self.solver.last_unsat and self.limit == 0:
+        improving = not self.solver.last_unsat
+        if improving and self.limit == 0:
             self.solver.solve_unknown()
         else:
             self.controller.solve()
         # reset previous limit
         self.conf.solve_limit = self.previous_limit
+        # record the outcome of improving
+        if improving:
+            result = self.solver.solving_result
+            if result == utils.SATISFIABLE:
+                outcome = schedule.OUTCOME_SAT
+            elif result == utils.UNSATISFIABLE:
+                outcome = schedule.OUTCOME_UNSAT
+            else:
+                outcome = schedule.OUTCOME_UNKNOWN
+            conflicts = int(self.stats['conflicts']) if self.limit else 0
+            self.schedule.outcome(
+                self.solver.step, self.limit, conflicts, outcome
+            )
         # gather search results
         if self.solver.solving_result == utils.SATISFIABLE:
             if self.solver.last_unsat:
@@ -354,6 +597,66 @@ class ImproveLimitController(MethodController):
         self.solver.handle_unknown_models(result)
 
 
+# improves every model in neighborhoods of it, where the other atoms are
+# fixed, under a conflict budget, and without neighborhood when the
+# fraction of fixed atoms is too small (only then optimality is proven)
+class LNSController(MethodController):
+
+    def __init__(self, solver, controller):
+        MethodController.__init__(self, solver)
+        self.controller = controller
+        fraction, self.conflicts, strategy = solver.options.lns
+        self.neighborhood = lns.Neighborhood(fraction, strategy)
+        solver.stats_functions.append(self.neighborhood.stats)
+        solver.set_holds_domain = True
+
+    def start(self):
+        self.controller.start()
+
+    def start_loop(self):
+        self.controller.start_loop()
+
+    def solve(self):
+        solver = self.solver
+        if solver.last_unsat:
+            self.neighborhood.reset()
+            self.controller.solve()
+            return
+        holds = set(solver.holds)
+        values = dict([
+            (solver.get_holds_function(x, 0), x in holds)
+            for x in solver.holds_open
+        ])
+        atoms = solver.control.symbolic_atoms
+        shown = [x for x in solver.shown if x in atoms]
+        while True:
+            assumptions = self.neighborhood.get(values, shown)
+            if assumptions is None:
+                self.controller.solve()
+                return
+            # the control may be replaced (with --retire)
+            conf = solver.control.configuration.solve
+            old_assumptions, old_limit = solver.assumptions, conf.solve_limit
+            solver.assumptions = old_assumptions + assumptions
+            conf.solve_limit = "{},umax".format(self.conflicts)
+            try:
+                self.controller.solve()
+            finally:
+                solver.assumptions = old_assumptions
+                conf.solve_limit = old_limit
+            result = solver.solving_result
+            if result == utils.SATISFIABLE:
+                self.neighborhood.outcome(lns.OUTCOME_SAT)
+                return
+            elif result == utils.UNSATISFIABLE:
+                self.neighborhood.outcome(lns.OUTCOME_UNSAT)
+            else:
+                self.neighborhood.outcome(lns.OUTCOME_UNKNOWN)
+
+    def unsat(self):
+        self.controller.unsat()
+
+
 #
 # class OnOptimal
 #
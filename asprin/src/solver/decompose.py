@@ -0,0 +1,127 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+import multiprocessing
+from . import preferences
+
+
+#
+# DEFINES
+#
+
+DECOMPOSE = "--decompose"
+TRACE     = "--trace"
+OPTIMIZE  = "--optimize={}"
+ONE_MODEL = "1"
+
+STATS = "\nDecompose    : {} components, {} workers, {}\n"
+
+
+#
+# Decomposition
+#
+# The root of the specification is a pareto or and preference whose
+# children have disjoint formulas, and every child is optimized in a worker
+# process (running asprin on the same input with --optimize=<child>).
+# Combining optimal models of the children gives an optimal model of the
+# root if the combination is a model (this is checked by the solver),
+# what holds when the base program of the children is independent.
+#
+
+# returns a list of (name, formulas) for the children of the root,
+# or None if there is no decomposition
+def get_components(symbolic_atoms, underscores):
+    out = preferences.get_preferences(symbolic_atoms, underscores)
+    if out is None:
+        return None
+    _preferences, roots = out
+    if len(roots) != 1 or roots[0] not in _preferences:
+        return None
+    root = _preferences[roots[0]]
+    if root.type not in [preferences.PARETO, preferences.AND] or \
+       len(root.children) < 2:
+        return None
+    components, seen = [], set()
+    for _, child in root.children:
+        formulas = get_formulas(child, set())
+        if formulas & seen:
+            return None
+        seen |= formulas
+        components.append((child.name, formulas))
+    return components
+
+
+def get_formulas(preference, visited):
+    if preference.name in visited:
+        return set()
+    visited.add(preference.name)
+    out = set(preference.formulas)
+    for _, child in preference.children:
+        out |= get_formulas(child, visited)
+    return out
+
+
+# the arguments for the workers, without --decompose and --trace
+def get_arguments(args):
+    out, skip = [], False
+    for i in args:
+        if skip:
+            skip = False
+        elif i.startswith(DECOMPOSE):
+            pass
+        elif i.startswith(TRACE):
+            skip = i == TRACE
+        else:
+            out.append(i)
+    return out
+
+
+# returns the formulas of the optimal model found for the component name
+# (as strings), or None if there is no optimal model
+def solve_component(job):
+    name, args = job
+    from ..main import api
+    holds = None
+    try:
+        options = args + [OPTIMIZE.format(name), ONE_MODEL]
+        for model in api.solve([], options):
+            if model.optimal:
+                holds = [str(x) for x in model.holds]
+    except Exception:
+        return name, None
+    return name, holds
+
+
+# returns a dictionary mapping the names of the components to their holds
+def solve_components(names, args, workers):
+    args = get_arguments(args)
+    try:
+        pool = multiprocessing.Pool(workers)
+    except AssertionError: # daemonic processes (like the workers of --server)
+        return {}
+    try:
+        jobs = [(name, args) for name in names]
+        return dict(pool.map(solve_component, jobs))
+    finally:
+        pool.terminate()
+        pool.join()
@@ -0,0 +1,129 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+import random
+
+
+#
+# DEFINES
+#
+
+HOLDS  = "holds"
+SHOWN  = "shown"
+AUTO   = "auto"
+STRATEGIES = [HOLDS, SHOWN]
+
+CONFLICTS = 1000 # default conflict budget of every neighborhood
+DECREASE  = 0.8  # of the fraction, when there is no better model
+INCREASE  = 1.1  # of the fraction, when the budget is reached
+MINIMUM   = 0.05 # below this fraction, search without neighborhood
+MAXIMUM   = 0.99
+PATIENCE  = 20   # neighborhoods without a better model before a full search
+SEED      = 0
+
+OUTCOME_SAT     = "sat"
+OUTCOME_UNSAT   = "unsat"
+OUTCOME_UNKNOWN = "unknown"
+
+STATS_HEADER   = """
+LNS          : {} attempts, {} sat, {} unsat, {} unknown, {} full (fraction {:.2f})"""
+STATS_STRATEGY = "  {:<6} {} attempts, {} sat"
+
+
+#
+# Neighborhood
+#
+# get() returns the assumptions fixing a fraction of the atoms
+# to their values in the last model, or None if the search should
+# not be restricted, and outcome() adapts the fraction and the strategy:
+# * if there is no better model in the neighborhood, fix less atoms
+# * if the budget is reached, fix more atoms
+# * after PATIENCE neighborhoods without a better model, or if the budget is
+#   reached fixing the MAXIMUM fraction, search without neighborhood
+# With strategy auto, the strategy with the best success rate is used
+#
+
+class Neighborhood:
+
+    def __init__(self, fraction, strategy):
+        self.initial    = fraction
+        self.fraction   = fraction
+        self.strategies = STRATEGIES if strategy == AUTO else [strategy]
+        self.strategy   = self.strategies[0]
+        self.random     = random.Random(SEED)
+        self.attempts   = dict([(s, [0, 0]) for s in self.strategies])
+        self.count      = {OUTCOME_SAT : 0, OUTCOME_UNSAT : 0,
+                           OUTCOME_UNKNOWN : 0}
+        self.full       = 0
+        self.failures   = 0
+
+    # for every new optimal model
+    def reset(self):
+        self.fraction = self.initial
+        self.failures = 0
+
+    def __rate(self, strategy):
+        attempts, sat = self.attempts[strategy]
+        return (sat + 1.0) / (attempts + 2.0)
+
+    def __sample(self, atoms):
+        size = int(round(self.fraction * len(atoms)))
+        return self.random.sample(atoms, size)
+
+    # holds maps the formulas of the last model to True or False,
+    # and shown is the list of shown atoms of the last model
+    def get(self, holds, shown):
+        if self.fraction < MINIMUM or self.failures >= PATIENCE:
+            self.full += 1
+            self.reset()
+            return None
+        self.strategy = max(self.strategies, key=self.__rate)
+        if self.strategy == HOLDS:
+            return [(x, holds[x]) for x in self.__sample(sorted(holds))]
+        return [(x, True) for x in self.__sample(shown)]
+
+    def outcome(self, result):
+        self.count[result] += 1
+        self.attempts[self.strategy][0] += 1
+        if result == OUTCOME_SAT:
+            self.attempts[self.strategy][1] += 1
+            self.failures = 0
+            return
+        self.failures += 1
+        if result == OUTCOME_UNSAT:
+            self.fraction *= DECREASE
+        elif self.fraction >= MAXIMUM:
+            self.failures = PATIENCE
+        else:
+            self.fraction = min(self.fraction * INCREASE, MAXIMUM)
+
+    def stats(self):
+        out = STATS_HEADER.format(
+            sum(self.count.values()), self.count[OUTCOME_SAT],
+            self.count[OUTCOME_UNSAT], self.count[OUTCOME_UNKNOWN], self.full,
+            self.fraction
+        )
+        for strategy in self.strategies:
+            attempts, sat = self.attempts[strategy]
+            out += "\n" + STATS_STRATEGY.format(strategy, attempts, sat)
+        return out + "\n"
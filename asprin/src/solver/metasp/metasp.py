@@ -28,6 +28,9 @@
 
 import clingo
 import re
+import os
+import hashlib
+import tempfile
 from . import metasp_programs
 from . import reify
 from ...utils import utils
@@ -43,12 +46,19 @@ PREFERENCE = utils.PREFERENCE
 OPTIMIZE   = utils.OPTIMIZE
 VOLATILE      = utils.VOLATILE
 HOLDS         = utils.HOLDS
+CURRENT       = utils.CURRENT
 UNSAT_ATOM    = utils.UNSAT
 HOLDS_AT_ZERO = utils.HOLDS_AT_ZERO
 
+# for --meta-cache
+META_CACHE_VERSION = "1"
+META_CACHE_SUFFIX  = ".lp"
+WARNING_META_CACHE = "WARNING: meta cache file could not be written:\n  {}"
+
 METAPREF_BASIC = """
 { ##""" + HOLDS + """(X,0..1) } :- X = @get_holds_domain().
 ##""" + VOLATILE + """(##m(0),##m(1)).
+##""" + CURRENT + """(##m(0),##m(1)).
 :- ##""" + UNSAT_ATOM + """(##m(0),##m(1)).
 #show ##""" + HOLDS + """/2.
 #const ##m1=0.
@@ -246,6 +256,39 @@ class AbstractMetasp:
     def get_meta_base_facts(self, prefix):
         return None
 
+    # private
+    # uses get_meta_pref_facts() and the directory of option --meta-cache
+    # the key depends on everything used for computing the facts
+    def get_cached_meta_pref_facts(self, prefix):
+        directory = getattr(self.solver.options, 'meta_cache', None)
+        if directory is None:
+            return self.get_meta_pref_facts(prefix)
+        # key
+        key = hashlib.sha1()
+        for i in [META_CACHE_VERSION, clingo.__version__,
+                  self.__class__.__name__, prefix,
+                  str(self.solver.options.solving_mode), self.get_pref(),
+                  "\n".join(sorted(str(x) for x in self.solver.holds_domain))]:
+            key.update(i.encode())
+            key.update(b"\0")
+        file_name = os.path.join(directory, key.hexdigest() + META_CACHE_SUFFIX)
+        # hit
+        if os.path.isfile(file_name):
+            with open(file_name) as f:
+                return f.read()
+        # miss: compute and write (through a temporary file)
+        facts = self.get_meta_pref_facts(prefix)
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            fd, tmp_name = tempfile.mkstemp(dir=directory)
+            with os.fdopen(fd, 'w') as f:
+                f.write(facts)
+            os.rename(tmp_name, file_name)
+        except (IOError, OSError) as e:
+            self.solver.printer.print_warning(WARNING_META_CACHE.format(e))
+        return facts
+
     # public
     # uses get_meta_base_facts(), get_meta_pref_facts and binding0
     def get_meta_program(self):
@@ -255,7 +298,7 @@ class AbstractMetasp:
         meta_base += metasp_programs.metaD_program.replace("##", prefix)
         # pref
         prefix = self.solver.underscores + "_"*U_METAPREF
-        meta_pref = self.get_meta_pref_facts(prefix)
+        meta_pref = self.get_cached_meta_pref_facts(prefix)
         meta_pref += metasp_programs.metaD_program.replace("##", prefix)
         # binding
         meta_bind = self.get_meta_bind(self.binding_simple)
@@ -268,7 +311,7 @@ class AbstractMetasp:
         u = self.solver.underscores
         prefix = u + "_"*U_METAPREF
         # base
-        base = self.get_meta_pref_facts(prefix)
+        base = self.get_cached_meta_pref_facts(prefix)
         base += metasp_programs.metaD_program_inc_base.replace("##", prefix)
         base += self.binding_inc_base.replace("$$", u).replace("##", prefix)
         # parameters
@@ -23,6 +23,7 @@
 
 
 # imports
+import os
 import subprocess
 import tempfile
 import re
@@ -307,66 +308,103 @@ OUTPUT_FACTS = """\
 {0}output({1},{2}). {0}literal_tuple({2}). {0}literal_tuple({2},{3}).
 """
 
-def reify_from_string_through_sat(program, prefix):
-
-    # translate to dimacs
-    check_clingo_version()
-    # write program to file_in
-    with tempfile.NamedTemporaryFile(delete=False) as file_in:
-        file_in.write(program.encode())
-        file_in.flush()
-    # run commands
-    ps1 = subprocess.Popen(
-        [CLINGO, SMODELS_OUTPUT, file_in.name], stdout=subprocess.PIPE
-    )
-    ps2 = subprocess.Popen(
-        [LP2NORMAL] + LP2NORMAL_OPTIONS,
-        stdin=ps1.stdout, stdout=subprocess.PIPE
-    )
-    dimacs = subprocess.check_output(
-        [LP2SAT] + LP2SAT_OPTIONS, stdin=ps2.stdout
-    )
-    if isinstance(dimacs, bytes):
-        dimacs = dimacs.decode()
-
-    # generate output
-    output = ""
-    literal_tuples = 1
-    for line in dimacs.splitlines():
+# patterns for the dimacs output of lp2sat
+DIMACS_HEADER  = re.compile(r'p\s+cnf\s+(\d+)\s(\d+)\s*\Z')
+DIMACS_COMMENT = re.compile(r'c\s+(\d+)\s(.*)\Z')
+
+def clause_to_facts(prefix, literal_tuple, literals):
+    clause = [
+        "{0}rule(disjunction(1),normal({1})).".format(prefix, literal_tuple),
+        " {0}literal_tuple({1}).".format(prefix, literal_tuple)
+    ]
+    for lit in literals:
+        clause.append(" {0}literal_tuple({1},{2}).".format(
+            prefix, literal_tuple, lit[1:] if lit[0] == "-" else "-" + lit
+        ))
+    clause.append("\n")
+    return "".join(clause)
+
+# yields the meta facts for every line of the dimacs input (lines may be bytes)
+def dimacs_to_facts(lines, prefix):
+    literal_tuples, literals = 1, []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode()
+        line = line.rstrip("\r\n")
+        if not line:
+            continue
 
         # first line
-        match = re.match(r'p\s+cnf\s+(\d+)\s(\d+)\s*\Z', line)
-        if match:
-            atoms = int(match.group(1))
-            if atoms > 0:
-                output += CHOICE_FACTS.format(prefix, atoms)
-            continue
+        if line[0] == 'p':
+            match = DIMACS_HEADER.match(line)
+            if match:
+                atoms = int(match.group(1))
+                if atoms > 0:
+                    yield CHOICE_FACTS.format(prefix, atoms)
+                continue
 
         # comments
-        match = re.match(r'c\s+(\d+)\s(.*)\Z', line)
-        if match:
-            output += OUTPUT_FACTS.format(
-                prefix, match.group(2), literal_tuples, match.group(1)
-            )
-            literal_tuples += 1
-            continue
         if line[0] == 'c':
+            match = DIMACS_COMMENT.match(line)
+            if match:
+                yield OUTPUT_FACTS.format(
+                    prefix, match.group(2), literal_tuples, match.group(1)
+                )
+                literal_tuples += 1
             continue
 
-        # clauses
-        output += "{0}rule(disjunction(1),normal({1})).".format(
-            prefix, literal_tuples
-        )
-        output += " {0}literal_tuple({1}).".format(prefix, literal_tuples)
+        # clauses (a clause may span many lines, and ends with 0)
         for lit in line.split():
             if lit != "0":
-                output += " {0}literal_tuple({1},{2}).".format(
-                    prefix, literal_tuples,
-                    lit[1:] if lit[0] == "-" else "-" + lit
-                )
-        output += "\n"
-        literal_tuples += 1
+                literals.append(lit)
+                continue
+            yield clause_to_facts(prefix, literal_tuples, literals)
+            literal_tuples, literals = literal_tuples + 1, []
+
+    # last clause without 0
+    if literals:
+        yield clause_to_facts(prefix, literal_tuples, literals)
+
+# the commands can be replaced (for example, by local stand-ins when testing)
+def reify_from_string_through_sat(
+    program, prefix, clingo=None, lp2normal=None, lp2sat=None
+):
+
+    if clingo is None:
+        clingo = [CLINGO]
+        check_clingo_version()
+    if lp2normal is None:
+        lp2normal = [LP2NORMAL] + LP2NORMAL_OPTIONS
+    if lp2sat is None:
+        lp2sat = [LP2SAT] + LP2SAT_OPTIONS
+
+    # write program to file_in
+    with tempfile.NamedTemporaryFile(delete=False) as file_in:
+        file_in.write(program.encode())
+        file_in.flush()
+
+    # run commands, and translate the dimacs output while it is read
+    try:
+        ps1 = subprocess.Popen(
+            clingo + [SMODELS_OUTPUT, file_in.name], stdout=subprocess.PIPE
+        )
+        ps2 = subprocess.Popen(
+            lp2normal, stdin=ps1.stdout, stdout=subprocess.PIPE
+        )
+        ps1.stdout.close()
+        ps3 = subprocess.Popen(
+            lp2sat, stdin=ps2.stdout, stdout=subprocess.PIPE
+        )
+        ps2.stdout.close()
+        output = "".join(dimacs_to_facts(ps3.stdout, prefix))
+        ps3.stdout.close()
+        code = ps3.wait()
+        ps2.wait()
+        ps1.wait()
+        if code:
+            raise subprocess.CalledProcessError(code, lp2sat)
+    finally:
+        os.remove(file_in.name)
 
     # return output
     return output
-
@@ -0,0 +1,237 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+import clingo
+from ..utils import utils
+
+
+#
+# DEFINES
+#
+
+SUBSET          = "subset"
+SUPERSET        = "superset"
+LESS_CARD       = "less(cardinality)"
+MORE_CARD       = "more(cardinality)"
+LESS_WEIGHT     = "less(weight)"
+MORE_WEIGHT     = "more(weight)"
+PARETO          = "pareto"
+LEXICO          = "lexico"
+AND             = "and"
+BASIC_TYPES     = set([SUBSET, SUPERSET, LESS_CARD, MORE_CARD,
+                       LESS_WEIGHT, MORE_WEIGHT])
+COMPOSITE_TYPES = set([PARETO, LEXICO, AND])
+TYPES           = BASIC_TYPES | COMPOSITE_TYPES
+
+FOR  = "for"
+NAME = "name"
+
+STATS = "\nDominance    : {} of {} programs grounded\n"
+
+
+#
+# Preference
+#
+# A preference statement of a built-in type whose relations better,
+# bettereq and eq can be evaluated on the sets of formulas (holds) of two
+# models, following the definitions of asprin_lib.lp
+#
+
+class Preference:
+
+    def __init__(self, name, _type):
+        self.name     = name
+        self.type     = _type
+        self.formulas = set()
+        self.weights  = []    # (formula, weight tuple)
+        self.children = []    # (weight, name), later (weight, Preference)
+
+    def __get(self, atuple):
+        try:
+            return atuple.arguments[0]
+        except:
+            return atuple
+
+    # the sum of the weights of the different tuples of the true formulas
+    def __value(self, holds):
+        if self.type in [LESS_CARD, MORE_CARD]:
+            return len(holds & self.formulas)
+        tuples = set([t for x, t in self.weights if x in holds])
+        weights = [self.__get(t) for t in tuples]
+        return sum([w.number for w in weights
+                    if w.type == clingo.SymbolType.Number])
+
+    def __compare(self, a, b, strict):
+        if self.type in [SUBSET, SUPERSET]:
+            a, b = a & self.formulas, b & self.formulas
+            if self.type == SUPERSET:
+                a, b = b, a
+            return a < b if strict else a <= b
+        a, b = self.__value(a), self.__value(b)
+        if self.type in [MORE_CARD, MORE_WEIGHT]:
+            a, b = b, a
+        return a < b if strict else a <= b
+
+    def better(self, a, b):
+        if self.type in BASIC_TYPES:
+            return self.__compare(a, b, True)
+        children = [p for _, p in self.children]
+        if self.type == AND:
+            return all([p.better(a, b) for p in children])
+        if self.type == PARETO:
+            if len(children) == 1:
+                return children[0].better(a, b)
+            return all([p.bettereq(a, b) for p in children]) and \
+                   any([p.better(a, b) for p in children])
+        # lexico: the first child that is not equal decides
+        for _, p in sorted(self.children, key=lambda x: x[0], reverse=True):
+            if p.better(a, b):
+                return True
+            if not p.eq(a, b):
+                return False
+        return False
+
+    def bettereq(self, a, b):
+        if self.type in BASIC_TYPES:
+            return self.__compare(a, b, False)
+        if self.type == PARETO:
+            return all([p.bettereq(a, b) for _, p in self.children])
+        return self.better(a, b) or self.eq(a, b)
+
+    def eq(self, a, b):
+        if self.type in [SUBSET, SUPERSET]:
+            return a & self.formulas == b & self.formulas
+        if self.type in BASIC_TYPES:
+            return self.__value(a) == self.__value(b)
+        return all([p.eq(a, b) for _, p in self.children])
+
+    # a summary of holds: the set size for subset and superset, the sum for
+    # cardinality and weight, the list of the children for pareto and and,
+    # the level vector for lexico, and None for other types
+    def quality(self, holds):
+        if self.type in [SUBSET, SUPERSET]:
+            return len(holds & self.formulas)
+        if self.type in BASIC_TYPES:
+            return self.__value(holds)
+        if self.type not in COMPOSITE_TYPES:
+            return None
+        children = self.children
+        if self.type == LEXICO:
+            children = sorted(children, key=lambda x: x[0], reverse=True)
+        return [p.quality(holds) for _, p in children]
+
+
+# returns a dictionary of Preference objects by name, and the list of names
+# in the optimize statements, or None if some preference statement is not
+# supported (if strict, otherwise its type is None and it has no quality)
+def get_preferences(symbolic_atoms, u, strict=True):
+    preferences = {}
+    for atom in symbolic_atoms.by_signature(u + utils.PREFERENCE, 2):
+        name, _type = atom.symbol.arguments
+        if strict and (not atom.is_fact or str(_type) not in TYPES):
+            return None
+        preferences[name] = Preference(name, str(_type))
+    for atom in symbolic_atoms.by_signature(u + utils.PREFERENCE, 5):
+        name, _, _, elem, weight = atom.symbol.arguments
+        preference = preferences.get(name)
+        if not atom.is_fact or preference is None or \
+           elem.type != clingo.SymbolType.Function or \
+           len(elem.arguments) != 1:
+            if strict:
+                return None
+            # a skipped element would make the quality wrong
+            if preference is not None:
+                preference.type = None
+        elif elem.name == FOR:
+            preference.formulas.add(elem.arguments[0])
+            preference.weights.append((elem.arguments[0], weight))
+        elif elem.name == NAME:
+            preference.children.append((weight, elem.arguments[0]))
+        elif strict:
+            return None
+        else:
+            preference.type = None
+    for preference in preferences.values():
+        children = [(w, preferences.get(n)) for w, n in preference.children]
+        if None in [p for _, p in children]:
+            if strict:
+                return None
+            preference.type = None
+        preference.children = [(w, p) for w, p in children if p is not None]
+        if preference.type in COMPOSITE_TYPES and not preference.children:
+            if strict:
+                return None
+            preference.type = None
+    roots = [atom.symbol.arguments[0] for atom in
+             symbolic_atoms.by_signature(u + utils.OPTIMIZE, 1)]
+    return preferences, roots
+
+
+#
+# Archive
+#
+# Stores the optimal models and returns those that are better than a model,
+# so that their programs are grounded only when they are needed
+#
+
+class Archive:
+
+    def __init__(self, control, underscores):
+        self.models   = []    # (step, holds)
+        self.added    = 0
+        self.grounded = 0
+        self.root     = self.__build(control.symbolic_atoms, underscores)
+
+    # returns None if some preference statement is not supported
+    def __build(self, symbolic_atoms, u):
+        out = get_preferences(symbolic_atoms, u)
+        if out is None:
+            return None
+        preferences, roots = out
+        if len(roots) != 1 or roots[0] not in preferences:
+            return None
+        return preferences[roots[0]]
+
+    def supported(self):
+        return self.root is not None
+
+    def add(self, step, holds):
+        self.models.append((step, frozenset(holds)))
+        self.added += 1
+
+    def clear(self):
+        self.models = []
+
+    # returns the step of an optimal model better than holds, or None,
+    # the model is removed because its program is grounded after this
+    def better(self, holds):
+        holds = frozenset(holds)
+        for i, (step, optimal) in enumerate(self.models):
+            if self.root.better(optimal, holds):
+                del self.models[i]
+                self.grounded += 1
+                return step
+        return None
+
+    def stats(self):
+        return STATS.format(self.grounded, self.added)
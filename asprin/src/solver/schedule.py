@@ -0,0 +1,170 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+
+#
+# DEFINES
+#
+
+FIXED     = "fixed"
+GEOMETRIC = "geometric"
+LUBY      = "luby"
+ADAPTIVE  = "adaptive"
+SCHEDULES = [FIXED, GEOMETRIC, LUBY, ADAPTIVE]
+
+GEOMETRIC_RATIO  = 2.0
+ADAPTIVE_WARMUP  = 3    # attempts before using the learnt budgets
+ADAPTIVE_DECAY   = 0.8  # for the moving average of the success rate
+ADAPTIVE_QUANTILE = 0.9 # of the conflicts of successful attempts
+
+OUTCOME_SAT     = "sat"
+OUTCOME_UNSAT   = "unsat"
+OUTCOME_UNKNOWN = "unknown"
+
+STATS_HEADER = "\nImprove Limit: {} ({} attempts, {} sat, {} unsat, {} unknown)"
+STATS_STEP   = "  Step {:<6} budget {:<10} conflicts {:<10} {}"
+
+
+#
+# Schedules
+#
+# budget(base) returns the conflict limit for the next improving step,
+# where base is the number of conflicts for the first model of the
+# iteration (with ',all', for all its models), and
+# outcome() records the result of every improving step
+#
+
+class FixedSchedule:
+
+    def __init__(self, multiplier, minimum):
+        self.multiplier = multiplier
+        self.minimum    = minimum
+        self.attempts   = []  # (step, budget, conflicts, outcome)
+
+    def get_name(self):
+        return FIXED
+
+    def scale(self, base):
+        return (1 if base == 0 else base) * self.multiplier
+
+    def budget(self, base):
+        return max(int(self.scale(base)), self.minimum)
+
+    def outcome(self, step, budget, conflicts, result):
+        self.attempts.append((step, budget, conflicts, result))
+
+    def stats(self):
+        count = {OUTCOME_SAT : 0, OUTCOME_UNSAT : 0, OUTCOME_UNKNOWN : 0}
+        for _, _, _, result in self.attempts:
+            count[result] += 1
+        out = STATS_HEADER.format(
+            self.get_name(), len(self.attempts), count[OUTCOME_SAT],
+            count[OUTCOME_UNSAT], count[OUTCOME_UNKNOWN]
+        )
+        for step, budget, conflicts, result in self.attempts:
+            out += "\n" + STATS_STEP.format(step, budget, conflicts, result)
+        return out + "\n"
+
+
+# the budget grows with every attempt that reaches the limit
+class GeometricSchedule(FixedSchedule):
+
+    def __init__(self, multiplier, minimum, ratio=GEOMETRIC_RATIO):
+        FixedSchedule.__init__(self, multiplier, minimum)
+        self.ratio    = ratio
+        self.failures = 0
+
+    def get_name(self):
+        return GEOMETRIC
+
+    def scale(self, base):
+        return FixedSchedule.scale(self, base) * self.ratio ** self.failures
+
+    def outcome(self, step, budget, conflicts, result):
+        FixedSchedule.outcome(self, step, budget, conflicts, result)
+        if result == OUTCOME_UNKNOWN:
+            self.failures += 1
+
+
+# the budget of the i-th attempt is multiplied by luby(i): 1 1 2 1 1 2 4 ...
+class LubySchedule(FixedSchedule):
+
+    def get_name(self):
+        return LUBY
+
+    def luby(self, i):
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        while i != (1 << k) - 1:
+            i -= (1 << (k - 1)) - 1
+            k = 1
+            while (1 << k) - 1 < i:
+                k += 1
+        return 1 << (k - 1)
+
+    def scale(self, base):
+        luby = self.luby(len(self.attempts) + 1)
+        return FixedSchedule.scale(self, base) * luby
+
+
+# after a warm up, the budget covers the conflicts that most successful
+# attempts needed, scaled by the moving average of the success rate
+# (budgets are generous while improving pays off, and tight otherwise)
+# and by the multiplier
+class AdaptiveSchedule(FixedSchedule):
+
+    def __init__(self, multiplier, minimum):
+        FixedSchedule.__init__(self, multiplier, minimum)
+        self.needed = []
+        self.rate   = 1.0
+
+    def get_name(self):
+        return ADAPTIVE
+
+    def scale(self, base):
+        if len(self.attempts) < ADAPTIVE_WARMUP or not self.needed:
+            return FixedSchedule.scale(self, base)
+        needed = sorted(self.needed)
+        quantile = needed[int(ADAPTIVE_QUANTILE * (len(needed) - 1))]
+        return (1 + self.rate) * quantile * self.multiplier
+
+    def outcome(self, step, budget, conflicts, result):
+        FixedSchedule.outcome(self, step, budget, conflicts, result)
+        success = 0.0
+        if result != OUTCOME_UNKNOWN:
+            self.needed.append(conflicts)
+            success = 1.0
+        self.rate = ADAPTIVE_DECAY * self.rate + (1 - ADAPTIVE_DECAY) * success
+
+
+def get_schedule(name, multiplier, minimum, parameter=None):
+    if name == GEOMETRIC:
+        if parameter is not None:
+            return GeometricSchedule(multiplier, minimum, parameter)
+        return GeometricSchedule(multiplier, minimum)
+    elif name == LUBY:
+        return LubySchedule(multiplier, minimum)
+    elif name == ADAPTIVE:
+        return AdaptiveSchedule(multiplier, minimum)
+    return FixedSchedule(multiplier, minimum)
@@ -28,8 +28,12 @@
 import clingo
 import sys
 import math
+import json
 from threading import Condition
 from . import controller
+from . import preferences
+from . import trace
+from . import decompose
 from ..utils import printer
 from ..utils import utils
 from .metasp import metasp
@@ -58,7 +62,7 @@ UNKNOWN       = "UNKNOWN"
 END_LOOP      = "END_LOOP"
 END           = "END"
 SATISFIABLE   = utils.SATISFIABLE                   # used also by controller
-UNSATISFIABLE = "UNSATISFIABLE"
+UNSATISFIABLE = utils.UNSATISFIABLE                 # used also by controller
 
 # for meta-programming
 META_SIMPLE    = utils.META_SIMPLE
@@ -80,15 +84,18 @@ STR_SATISFIABLE        = "SATISFIABLE"
 STR_LIMIT              = "MODEL FOUND (SEARCH LIMIT)"
 STR_BENCHMARK_CLOCK    = "BENCHMARK"
 STR_BENCHMARK_FILE     = "benchmark.txt"
+STR_QUERY              = "Query {}: {}"
 
 # program names
 DO_HOLDS = "do_holds"
+DO_HOLDS_EXT = "do_holds_external"
 DO_HOLDS_APPROX = "do_holds_approx"
 DO_HOLDS_DELETE_BETTER = "do_holds_delete_better"
 DO_HOLDS_AT_ZERO = "do_holds_at_zero"
 OPEN_HOLDS = "open_holds"
 VOLATILE_FACT = "volatile_fact"
 VOLATILE_EXT = "volatile_external"
+CURRENT_MODEL = "current_model"
 DELETE_MODEL = "delete_model"
 DELETE_MODEL_VOLATILE = "delete_model_volatile"
 DELETE_MODEL_APPROX = "delete_model_approx"
@@ -96,6 +103,7 @@ UNSAT_PRG = "unsat"
 NOT_UNSAT_PRG = "not_unsat"
 CMD_HEURISTIC = "cmd_heuristic"
 PROJECT_CLINGO = "project_clingo"
+INITIAL_HEURISTIC = "initial_heuristic"
 PREFP = utils.PREFP
 PBASE = utils.PBASE
 APPROX = utils.APPROX
@@ -107,6 +115,8 @@ UNSATPBASE = utils.UNSATPBASE
 VOLATILE      = utils.VOLATILE
 MODEL         = utils.MODEL
 HOLDS         = utils.HOLDS
+CURRENT       = utils.CURRENT
+CURRENTP      = utils.CURRENTP
 UNSAT_ATOM    = utils.UNSAT
 PREFERENCE    = utils.PREFERENCE
 HOLDS_AT_ZERO = utils.HOLDS_AT_ZERO
@@ -122,6 +132,29 @@ same stable model computed twice, there is an error in the input, \
 probably an incorrect preference program"""
 WARNING_NO_OPTIMIZE = """WARNING: no optimize statement, \
 computing non optimal stable models"""
+# for --auto
+AUTO_GROUND_ONCE = 1000 # maximum size of the holds domain for --ground-once
+STR_AUTO         = "\nAuto         : {}\n"
+# for --retire
+STR_RETIRE       = "\nRetired      : {} steps, {} rebuilds\n"
+
+ERROR_QUERY = "incorrect query: {}"
+ERROR_CHECKPOINT = "incorrect line {} in checkpoint file {}"
+STR_RESUMED = "Resumed {} optimal model(s) from {}"
+UPDATE = "update_{}"
+STR_VARIANT = "Variant: {}"
+STR_HOLDS_DOMAIN = "\nHolds Domain : {} open, {} fixed true, {} fixed false\n"
+WARNING_DECOMPOSE = """WARNING: the preference specification cannot be \
+decomposed, solving it as a whole"""
+WARNING_DECOMPOSE_COMBINE = """WARNING: the optimal models of the components \
+do not combine into a model, solving the specification as a whole"""
+WARNING_UPDATE = "WARNING: incorrect update, ignoring it: {}\n"
+ERROR_INITIAL_MODEL = "incorrect atom in initial model: {}"
+WARNING_INITIAL_ATOM = "WARNING: incorrect atom in initial model, ignoring it: {}\n"
+WARNING_DOMINANCE_ARCHIVE = """WARNING: the preference specification is \
+not supported by option --dominance-archive, ignoring it"""
+WARNING_INITIAL_MODEL = """WARNING: the initial model is not a stable model, \
+starting from scratch"""
 STR_BETTER_THAN_UNKNOWN = "BETTER THAN MODEL(S): {}"
 STR_UNKNOWN_OPTIMAL = """\nINFO: The following MODEL(S) FOUND (with SEARCH LIMIT) \
 are OPTIMAL MODEL(S): {}"""
@@ -139,12 +172,20 @@ PROGRAMS = \
 #show ##holds_at_zero(X) : ##""" + HOLDS + """(X,0)."""),
    (DO_HOLDS,            ["m"],"""
 ##""" + HOLDS + """(X,m) :- X = @get_holds()."""),
+   (DO_HOLDS_EXT,        ["m"],"""
+#external ##""" + HOLDS + """(X,m) : X = @get_holds()."""),
    (OPEN_HOLDS,          ["m"],"""
-{ ##""" + HOLDS + """(X,m) } :- X = @get_holds_domain()."""),
+{ ##""" + HOLDS + """(X,m) } :- X = @get_holds_open().
+##""" + HOLDS + """(X,m) :- X = @get_holds_fixed()."""),
    (VOLATILE_FACT, ["m1","m2"],"""
 ##""" + VOLATILE + """(##m(m1),##m(m2))."""),
    (VOLATILE_EXT,  ["m1","m2"],"""
 #external ##""" + VOLATILE + """(##m(m1),##m(m2))."""),
+   (CURRENT_MODEL, ["m1","m2"],"""
+##""" + CURRENT  + """(##m(m1),##m(m2)) :- m1 = 0.
+##""" + CURRENT  + """(##m(m1),##m(m2)) :- m1 = """ +
+    str(MODEL_DELETE_BETTER) + """.
+##""" + CURRENTP + """(##m(m1),##m(m2)) :- m2 = 0."""),
    (DELETE_MODEL,           [],"""
 :-     ##""" + HOLDS + """(X,0) : X = @get_holds();
    not ##""" + HOLDS + """(X,0) : X = @get_nholds()."""),
@@ -167,6 +208,9 @@ PROGRAMS = \
     HOLDS + """(X,0)."""),
    (PROJECT_CLINGO,           [],"""
 #project  ##""" + HOLDS + """/2."""),
+   (INITIAL_HEURISTIC,        [],"""
+#heuristic ##""" + HOLDS + """(X,0) : X = @get_holds().  [ 1,sign]
+#heuristic ##""" + HOLDS + """(X,0) : X = @get_nholds(). [-1,sign]"""),
   ]
 PROGRAMS_APPROX = \
   [(DO_HOLDS_APPROX,            ["m","mm"],"""
@@ -228,14 +272,41 @@ class Solver:
         self.store_nholds = False
         self.approx_opt_models = []
         self.assumptions = []
+        self.projection = False
         self.last_model = None
         self.sequences = {}
         self.unknown = []
-        self.unknown_non_optimal = []
+        self.unknown_non_optimal = set()
+        self.unknown_new_non_optimal = []
+        self.unknown_pending = []
+        self.unknown_own = None
         self.grounded_delete_better = False
         self.mapping = {}
         self.unsat_program = PREFP
         self.unsat_program_base = None
+        # for retiring steps
+        self.control_factory = None # set by main.py
+        self.retire_holds = dict()
+        self.optimal_records = []
+        self.retired = 0
+        self.rebuilds = 0
+        # for --dominance-archive
+        self.dominance_archive = None
+        # for --updates and --variants
+        self.updates = 0
+        self.variants = []
+        self.variant = -1
+        self.restart_steps = []
+        self.restart_externals = []
+        self.restart_optimum = None
+        # for the library API (set by main.py)
+        self.listener = None
+        # for --decompose
+        self.decomposed = (0, 0, "not decomposed")
+        # for --trace
+        self.trace = None
+        if self.options.trace is not None:
+            self.trace = trace.Trace(self.options.trace)
         # for weak mode
         self.control.configuration.solve.opt_mode = 'ignore' # by default ignore
         self.optN = False
@@ -243,6 +314,9 @@ class Solver:
         # holds and shown domains
         self.set_holds_domain = False
         self.holds_domain = []
+        self.holds_open = []      # the part of the domain that is not fixed
+        self.holds_fixed = set()  # facts of the base program
+        self.holds_pruned = None  # (fixed, fixed false)
         self.set_shown_domain = False
         self.shown_domain = []
         # exiting
@@ -257,6 +331,10 @@ class Solver:
         #if self.options.max_models == 1 and not self.options.improve_limit:
         #    self.store_nholds = False
         self.saved_stats = False
+        self.stats_functions = [] # return strings for printing with --stats
+        self.stats_functions.append(self.holds_stats)
+        if self.options.auto:
+            self.stats_functions.append(self.auto_stats)
         if self.options.benchmark:
             start_clock(STR_BENCHMARK_CLOCK)
             with open(STR_BENCHMARK_FILE, 'w') as f:
@@ -281,12 +359,46 @@ class Solver:
     def get_holds_domain(self):
         return self.holds_domain
 
+    def get_holds_open(self):
+        return self.holds_open
+
+    def get_holds_fixed(self):
+        return list(self.holds_fixed)
+
+    # the formulas that are facts are fixed, and only the open ones are used
+    # for nholds and assumptions, while the formulas that are not in the
+    # domain are fixed false (they are counted only for the statistics)
     def do_set_holds_domain(self):
-        self.holds_domain = [
-            i.symbol.arguments[0] for i in
-                self.control.symbolic_atoms.by_signature(self.holds_str, 2)
-                if str(i.symbol.arguments[1]) == "0"
-        ]
+        self.holds_domain, self.holds_open, self.holds_fixed = [], [], set()
+        for atom in self.control.symbolic_atoms.by_signature(self.holds_str, 2):
+            if str(atom.symbol.arguments[1]) != "0":
+                continue
+            x = atom.symbol.arguments[0]
+            self.holds_domain.append(x)
+            if atom.is_fact and not atom.is_external:
+                self.holds_fixed.add(x)
+            else:
+                self.holds_open.append(x)
+        domain, false = set(self.holds_domain), set()
+        name = self.underscores + utils.PREFERENCE
+        for atom in self.control.symbolic_atoms.by_signature(name, 5):
+            elem = atom.symbol.arguments[3]
+            if elem.type == clingo.SymbolType.Function and \
+               elem.name == "for" and len(elem.arguments) == 1 and \
+               elem.arguments[0] not in domain:
+                false.add(elem.arguments[0])
+        self.holds_pruned = (len(self.holds_fixed), len(false))
+
+    # removes the fixed formulas
+    def get_open(self, holds):
+        return [x for x in holds if x not in self.holds_fixed]
+
+    def holds_stats(self):
+        if self.holds_pruned is None:
+            return ""
+        return STR_HOLDS_DOMAIN.format(
+            len(self.holds_open), self.holds_pruned[0], self.holds_pruned[1]
+        )
 
     def get_nholds(self):
         return self.nholds
@@ -368,6 +480,7 @@ class Solver:
         self.ground([(DO_HOLDS_AT_ZERO, [])], self)
 
     def add_projection(self):
+        self.projection = True
         self.ground([(PROJECT_CLINGO, [])], self)
         self.control.configuration.solve.project = 'project'
 
@@ -429,7 +542,8 @@ class Solver:
         if solve_conf.models != "0" and add_one:
             solve_conf.models = str(int(solve_conf.models) + 1)
         # assumptions
-        ass  = [ (self.get_holds_function(x,0),  True) for x in self.holds ]
+        ass  = [ (self.get_holds_function(x,0),  True)
+                 for x in self.get_open(self.holds) ]
         ass += [ (self.get_holds_function(x,0), False) for x in self.nholds]
         # solve
         self.old_shown, self.enumerate_flag = self.shown, False
@@ -447,6 +561,7 @@ class Solver:
             parts.append((VOLATILE_EXT,  [x,y]))
         else:
             parts.append((VOLATILE_FACT, [x,y]))
+        parts.append((CURRENT_MODEL, [x,y]))
         return parts
 
     def get_shown(self):
@@ -466,7 +581,14 @@ class Solver:
         self.ground([(HEURISTIC, [])], self)
 
     def ground_holds(self, step):
-        self.ground([(DO_HOLDS, [step])], self)
+        if self.options.retire is None:
+            self.ground([(DO_HOLDS, [step])], self)
+            return
+        # with --retire, holds are externals that can be released later
+        self.ground([(DO_HOLDS_EXT, [step])], self)
+        for x in self.holds:
+            self.control.assign_external(self.get_holds_function(x, step), True)
+        self.retire_holds[step] = self.holds
 
     def ground_holds_delete_better(self):
         if not self.grounded_delete_better:
@@ -491,6 +613,22 @@ class Solver:
 
     def handle_optimal_model(self, step, delete_model_volatile,
                              delete_worse, delete_better, volatile):
+        if self.options.retire is not None:
+            self.retire_holds.pop(step, None)
+            self.optimal_records.append((self.holds, self.nholds, (
+                step, delete_model_volatile, delete_worse, delete_better,
+                volatile
+            )))
+        # with --dominance-archive, the unsat program is grounded lazily
+        if delete_worse and self.dominance_archive is not None:
+            self.dominance_archive.add(step, self.holds)
+            delete_worse = False
+        # with --updates and --variants, the programs are relaxed
+        # before the next optimization
+        if self.options.updates or self.options.variants:
+            delete_model_volatile = True
+            self.restart_steps.append(step)
+            self.restart_optimum = self.holds
         if not delete_model_volatile:
             parts = [(DELETE_MODEL, [])]
         else:
@@ -513,6 +651,8 @@ class Solver:
             self.not_improving.append((MODEL_DELETE_BETTER,step))
         for x,y in self.not_improving:        #activate
             self.control.assign_external(self.get_external(x,y),True)
+        if self.options.updates or self.options.variants:
+            self.restart_externals.extend(self.not_improving)
         if not self.options.no_opt_improving: #reset
             self.not_improving = []
 
@@ -532,9 +672,8 @@ class Solver:
             elif self.store_holds:
                 self.holds.append(a.arguments[0])
         if self.store_nholds:
-            self.nholds = [
-                x for x in self.holds_domain if x not in set(self.holds)
-            ]
+            holds = set(self.holds)
+            self.nholds = [x for x in self.holds_open if x not in holds]
 
     def on_model_single(self, model):
         # call on_model
@@ -608,6 +747,8 @@ class Solver:
                 self.shown_domain_append(atom)
 
     def solve(self, *args, **kwargs):
+        if self.listener is not None:
+            self.listener.check()
         if self.options.configs is not None:
             self.set_config()
         result = self.control_proxy.solve(*args, **kwargs)
@@ -663,14 +804,16 @@ class Solver:
             self.solve_single_on_optimal()
             return
         # add projection if needed
-        if self.options.project:
+        if self.options.project and not self.projection:
             self.add_projection()
         # prepare to solve
         self.control.configuration.solve.models = self.options.max_models
         self.store_holds, self.store_nholds, self.keep_shown = [False]*3
         self.printer.do_print("Solving...")
         # solve and finish
-        result = self.solve(on_model=self.on_model_single)
+        result = self.solve(
+            assumptions=self.assumptions, on_model=self.on_model_single
+        )
         if result.exhausted:
             self.more_models = False
         if self.opt_models == 0:
@@ -688,6 +831,10 @@ class Solver:
         return str(symbol)
 
     def print_answer(self):
+        if self.listener is not None:
+            self.listener.on_answer(self)
+        if self.trace is not None:
+            self.trace.on_answer(self)
         self.printer.do_print(STR_ANSWER.format(self.models))
         self.printer.do_print(" ".join(map(self.symbol2str, self.shown)))
 
@@ -695,12 +842,21 @@ class Solver:
         self.print_unknowns(STR_BETTER_THAN_UNKNOWN, unknowns, mapping)
 
     def print_limit_string(self):
+        if self.listener is not None:
+            self.listener.on_status(self, False)
+        if self.trace is not None:
+            self.trace.on_status(False)
         self.printer.do_print(STR_LIMIT)
 
     def print_no_optimize_warning(self):
         self.printer.print_warning(WARNING_NO_OPTIMIZE)
 
     def print_optimum_string(self, star=False):
+        optimal = self.str_found == STR_OPTIMUM_FOUND
+        if self.listener is not None:
+            self.listener.on_status(self, optimal)
+        if self.trace is not None:
+            self.trace.on_status(optimal)
         if not star:
             self.printer.do_print(self.str_found)
         else:
@@ -714,6 +870,10 @@ class Solver:
             self.printer.do_print(STR_SATISFIABLE)
 
     def print_str_answer(self):
+        if self.listener is not None:
+            self.listener.on_answer(self)
+        if self.trace is not None:
+            self.trace.on_answer(self)
         self.printer.do_print(STR_ANSWER.format(self.models))
 
     def print_unknowns(self, string, unknowns, mapping):
@@ -734,8 +894,18 @@ class Solver:
     def relax_previous_models(self):
         for i in self.improving:
             self.control.release_external(self.get_external(0, i))
+            if self.options.retire is not None:
+                self.retire_step(i)
         self.improving = []
 
+    def retire_step(self, step):
+        self.externals.pop((0, step), None)
+        if step == self.last_model:
+            return
+        for x in self.retire_holds.pop(step, []):
+            self.control.release_external(self.get_holds_function(x, step))
+        self.retired += 1
+
     def relax_optimal_models(self):
         for x,y in self.not_improving:
             self.control.assign_external(self.get_external(x,y),False)
@@ -782,13 +952,14 @@ class Solver:
     def turn_off_preference_program(self):
         self.control.assign_external(self.get_external(0,-1), False)
         self.assumptions = (
-            [(self.get_holds_function(i,-1),False) for i in  self.holds_domain]
+            [(self.get_holds_function(i,-1),False) for i in  self.holds_open]
         )
 
     def turn_on_preference_program(self):
         self.control.assign_external(self.get_external(0,-1), True)
         self.assumptions = (
-            [(self.get_holds_function(i,-1),True)  for i in  self.holds] +
+            [(self.get_holds_function(i,-1),True)
+             for i in  self.get_open(self.holds)] +
             [(self.get_holds_function(i,-1),False) for i in self.nholds]
         )
 
@@ -819,7 +990,7 @@ class Solver:
 
     def get_nholds_approx(self, i):
         return [
-            x for x in self.holds_domain
+            x for x in self.holds_open
             if x not in set(self.approx_opt_models[int(str(i))])
         ]
 
@@ -879,6 +1050,308 @@ class Solver:
         self.end()
 
 
+    #
+    # hybrid (weak approximation as warm start)
+    #
+
+    def on_model_hybrid(self, model):
+        self.on_model(model)
+        self.hybrid_model = (self.holds, self.nholds, self.shown)
+        return model.cost != [] # stop if there is nothing to optimize
+
+    # returns True if the approximation finds a model within the limit,
+    # and leaves it as the last model computed
+    def solve_hybrid(self):
+        # approximation programs (weak constraints are ignored afterwards)
+        self.ground([(APPROX, [])], self)
+        # set opt_mode, models and limit
+        limit, seconds = self.options.hybrid
+        solve_conf = self.control.configuration.solve
+        old_models, old_limit = solve_conf.models, solve_conf.solve_limit
+        solve_conf.opt_mode, solve_conf.models = 'opt', 0
+        timeout = None
+        if seconds:
+            timeout = limit
+        else:
+            solve_conf.solve_limit = str(limit) + ",umax"
+        # solve
+        self.hybrid_model = None
+        self.solve(on_model=self.on_model_hybrid, timeout=timeout)
+        # restore
+        solve_conf.opt_mode = 'ignore'
+        solve_conf.models, solve_conf.solve_limit = old_models, old_limit
+        if self.hybrid_model is None:
+            return False
+        self.holds, self.nholds, self.shown = self.hybrid_model
+        self.solving_result = SATISFIABLE
+        return True
+
+    #
+    # initial model (--initial-model)
+    #
+
+    # reads facts or atoms separated by spaces, skipping comments
+    def read_initial_model(self):
+        with open(self.options.initial_model[0]) as f:
+            string = utils.strip_comments(f.read())
+        terms = []
+        for atom in utils.split_terms(string, ". \t\n"):
+            try:
+                terms.append(clingo.parse_term(atom))
+            except Exception:
+                raise Exception(ERROR_INITIAL_MODEL.format(atom))
+        return terms
+
+    def get_initial_assumptions(self, terms):
+        domain, holds, atoms = set(self.holds_domain), set(), []
+        symbolic_atoms = self.control.symbolic_atoms
+        for term in terms:
+            # numbers and strings are not atoms
+            if term.type != clingo.SymbolType.Function:
+                self.printer.print_warning(WARNING_INITIAL_ATOM.format(term))
+                continue
+            # holds(X) atoms, or shown atoms in the holds domain
+            if term.name == HOLDS and len(term.arguments) == 1:
+                term = term.arguments[0]
+            if term in domain:
+                holds.add(term)
+            elif term in symbolic_atoms:
+                atoms.append((term, True))
+            # atoms not in the new instance are skipped
+        positive = [(self.get_holds_function(x,0), True)
+                    for x in self.get_open(holds)]
+        negative = [(self.get_holds_function(x,0), False)
+                    for x in self.holds_open if x not in holds]
+        return positive + atoms, negative
+
+    def ground_initial_heuristic(self):
+        self.ground([(INITIAL_HEURISTIC, [])], self)
+        for _solver in self.control.configuration.solver:
+            _solver.heuristic="Domain"
+
+    # returns True if there is a model with the positive assumptions,
+    # trying first also with the negative ones
+    def solve_close_model(self, positive, negative):
+        solve_conf = self.control.configuration.solve
+        old_models, solve_conf.models = solve_conf.models, 1
+        for assumptions in [positive + negative, positive]:
+            self.solve(assumptions=assumptions + self.assumptions,
+                       on_model=self.on_model)
+            if self.solving_result == SATISFIABLE:
+                break
+        solve_conf.models = old_models
+        return self.solving_result == SATISFIABLE
+
+    # returns True if the initial model (or one close to it) is a model,
+    # and leaves it as the last model computed
+    def solve_initial_model(self):
+        positive, negative = self.get_initial_assumptions(
+            self.read_initial_model()
+        )
+        # first with the holds not in the file false, then without them
+        if not self.solve_close_model(positive, negative):
+            self.printer.print_warning(WARNING_INITIAL_MODEL)
+            return False
+        if self.options.initial_model[1]:
+            self.ground_initial_heuristic()
+        return True
+
+    #
+    # updates (--updates)
+    #
+
+    # reads update commands from stdin until solve (returns True)
+    # or exit (returns False)
+    def read_updates(self):
+        while True:
+            line = sys.stdin.readline()
+            if not line:
+                return False
+            line = line.strip()
+            command, _, argument = line.partition(" ")
+            if command == "solve":
+                return True
+            if command == "exit":
+                return False
+            if not line or line.startswith("%"):
+                continue
+            try:
+                self.do_update(command, argument.strip())
+            except Exception:
+                self.printer.print_warning(WARNING_UPDATE.format(line))
+
+    # assign <atom> true|false, release <atom>, or add <program>
+    def do_update(self, command, argument):
+        if command == "add":
+            name = UPDATE.format(self.updates)
+            self.updates += 1
+            self.control.add(name, [], argument)
+            self.ground([(name, [])], self)
+            return
+        arguments = argument.split()
+        atom = clingo.parse_term(arguments[0])
+        symbolic_atom = self.control.symbolic_atoms[atom]
+        if symbolic_atom is None or not symbolic_atom.is_external:
+            raise Exception()
+        if command == "release" and len(arguments) == 1:
+            self.control.release_external(atom)
+        elif command == "assign" and arguments[1:] in [["true"], ["false"]]:
+            self.control.assign_external(atom, arguments[1] == "true")
+        else:
+            raise Exception()
+
+    # the variants are the #optimize statements (see spec_parser/ast.py)
+    def set_variants(self):
+        name = self.underscores + utils.VARIANT_ON
+        self.variants = sorted([
+            x.symbol for x in self.control.symbolic_atoms.by_signature(name, 1)
+        ], key=str)
+        self.variant = -1
+        self.next_variant()
+
+    # returns False if there are no more variants
+    def next_variant(self):
+        if self.variant + 1 >= len(self.variants):
+            return False
+        if self.variant >= 0:
+            self.control.assign_external(self.variants[self.variant], False)
+        self.variant += 1
+        variant = self.variants[self.variant]
+        self.control.assign_external(variant, True)
+        self.printer.do_print(STR_VARIANT.format(variant.arguments[0]))
+        return True
+
+    def first_variant(self):
+        if self.variants:
+            self.control.assign_external(self.variants[self.variant], False)
+            self.variant = -1
+            self.next_variant()
+
+    # relaxes the programs of all optimal models (an update may make any of
+    # them infeasible), and resets the counters
+    def restart_optimization(self):
+        self.relax_previous_models()
+        for step in self.restart_steps:
+            atom = clingo.Function(self.delete_str, [clingo.Number(step)])
+            self.control.assign_external(atom, True)
+        for x, y in self.restart_externals:
+            self.control.release_external(self.get_external(x, y))
+            self.externals.pop((x, y), None)
+        self.restart_steps, self.restart_externals = [], []
+        self.not_improving = []
+        # added programs may have new formulas
+        if self.set_holds_domain:
+            self.do_set_holds_domain()
+        self.models, self.opt_models, self.more_models = 0, 0, True
+        self.last_unsat, self.last_model, self.old_holds = True, None, None
+        self.holds, self.nholds, self.shown = [], [], []
+
+    # returns True if the previous optimum (or one close to it) is a model,
+    # and leaves it as the last model computed
+    def solve_previous_optimum(self):
+        if self.restart_optimum is None:
+            return False
+        holds = set(self.restart_optimum)
+        positive = [(self.get_holds_function(x, 0), True)
+                    for x in self.get_open(holds)]
+        negative = [(self.get_holds_function(x, 0), False)
+                    for x in self.holds_open if x not in holds]
+        return self.solve_close_model(positive, negative)
+
+    #
+    # decomposition (--decompose)
+    #
+
+    # returns True if the optimal models of the components combine into
+    # a model, and leaves it as the last model computed
+    def solve_decomposed(self):
+        components = decompose.get_components(
+            self.control.symbolic_atoms, self.underscores
+        )
+        if components is None:
+            self.printer.print_warning(WARNING_DECOMPOSE)
+            return False
+        workers = self.options.decompose
+        if workers == 0:
+            workers = len(components)
+        results = decompose.solve_components(
+            [str(name) for name, _ in components], self.options.args, workers
+        )
+        self.decomposed = (len(components), workers, "not combined")
+        assumptions = []
+        for name, formulas in components:
+            holds = results.get(str(name))
+            if holds is None:
+                self.printer.print_warning(WARNING_DECOMPOSE_COMBINE)
+                return False
+            holds = set([clingo.parse_term(x) for x in holds])
+            assumptions += [(self.get_holds_function(x, 0), x in holds)
+                            for x in formulas]
+        solve_conf = self.control.configuration.solve
+        old_models, solve_conf.models = solve_conf.models, 1
+        self.solve(assumptions=assumptions + self.assumptions,
+                   on_model=self.on_model)
+        solve_conf.models = old_models
+        if self.solving_result != SATISFIABLE:
+            self.printer.print_warning(WARNING_DECOMPOSE_COMBINE)
+            return False
+        self.decomposed = (len(components), workers, "combined")
+        return True
+
+    def decompose_stats(self):
+        return decompose.STATS.format(*self.decomposed)
+
+    #
+    # checkpoints (--checkpoint and --resume)
+    #
+
+    # every line is a JSON object for an optimal model,
+    # the last line may be incomplete after a crash
+    def read_checkpoint(self, _file):
+        try:
+            with open(_file) as f:
+                lines = f.read().splitlines()
+        except IOError:
+            return [], []
+        records, good = [], []
+        for number, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+                holds = [clingo.parse_term(x) for x in record["holds"]]
+                shown = [clingo.parse_term(x) for x in record["shown"]]
+                records.append(
+                    (record["step"], holds, shown, record["models"])
+                )
+                good.append(line)
+            except Exception:
+                if number != len(lines) - 1:
+                    raise Exception(ERROR_CHECKPOINT.format(number+1, _file))
+        return records, good
+
+    def get_checkpoint_record(self, models):
+        return json.dumps({
+            "step"   : self.last_model,
+            "holds"  : [str(x) for x in self.holds],
+            "shown"  : [str(x) for x in self.shown],
+            "models" : models
+        }, separators=(',', ':'))
+
+    def write_checkpoint(self, _file, records, mode='a'):
+        with open(_file, mode) as f:
+            for record in records:
+                f.write(record + "\n")
+
+    # nholds are not stored, they are recomputed from the holds domain
+    def resume_optimal_model(self, step, holds, shown):
+        self.holds, self.shown = holds, shown
+        holds = set(holds)
+        self.nholds = [x for x in self.holds_open if x not in holds]
+        self.last_model = step
+        self.ground_holds(step)
+
+    def print_resumed(self, number, _file):
+        self.printer.do_print(STR_RESUMED.format(number, _file))
+
     #
     # unknown (--improve-limit)
     #
@@ -889,6 +1362,9 @@ class Solver:
 
     def enumerate_unknown(self):
 
+        # check the pending models of --improve-batch
+        if self.unknown_pending:
+            self.check_unknown_models()
         # if no unknowns, or computed all: return
         if not self.unknown:
             self.more_models = False
@@ -929,9 +1405,8 @@ class Solver:
                 return
             # pre
             self.holds  = holds.get(step, [])
-            self.nholds = [
-                x for x in self.holds_domain if x not in set(self.holds)
-            ]
+            true = set(self.holds)
+            self.nholds = [x for x in self.holds_open if x not in true]
             delete_model = clingo.parse_term(
                 "{}({})".format(self.delete_str, step)
             )
@@ -951,8 +1426,9 @@ class Solver:
     def on_model_unknown(self, model):
         atoms = model.symbols(atoms=True)
         for i in self.unknown:
-            if not self.get_unsat_function(MODEL_DELETE_BETTER, i) in atoms:
-                self.unknown_non_optimal.append(i)
+            if i != self.unknown_own and i not in self.unknown_non_optimal and \
+               not self.get_unsat_function(MODEL_DELETE_BETTER, i) in atoms:
+                self.unknown_new_non_optimal.append(i)
 
     def handle_unknown_models(self, result):
 
@@ -963,26 +1439,61 @@ class Solver:
                 self.mapping[self.last_model] = self.models
             return
 
-        # else check if some unknowns are worse than the latest model
-        # assumptions
-        ass  = [ (self.get_holds_function(x,0),  True) for x in self.holds ]
-        ass += [ (self.get_holds_function(x,0), False) for x in self.nholds]
-        ass += [                             (x, True) for x in self.shown]
+        # the latest model is checked against the unknowns (with
+        # --improve-batch, together with the latest models of other steps)
+        own = self.last_model if result == UNKNOWN else None
+        self.unknown_pending.append((self.holds, self.nholds, self.shown, own))
+        # if UNKNOWN, add delete better for last model (w/out unsat constraint)
+        if result == UNKNOWN:
+            x, y  = MODEL_DELETE_BETTER, self.last_model
+            parts = [(self.unsat_program, [x, y]), (VOLATILE_EXT,  [x,y])]
+            self.ground(parts, self)
+            # also, add mapping
+            self.mapping[self.last_model] = self.models
+            self.unknown.append(self.last_model)
+        if len(self.unknown_pending) >= self.options.improve_batch:
+            self.check_unknown_models()
+
+    # check if some unknowns are worse than the pending models,
+    # with one solve call for every pending model,
+    # and then release or deactivate every unknown once
+    def check_unknown_models(self):
+        pending, self.unknown_pending = self.unknown_pending, []
+        if not self.unknown:
+            return
         # turn unknowns on
         for i in self.unknown:
             self.control.assign_external(
                 self.get_external(MODEL_DELETE_BETTER, i), True
             )
         # solve
-        self.unknown_non_optimal = []
-        if self.unknown:
+        self.unknown_non_optimal = set()
+        for holds, nholds, shown, own in pending:
+            if len(self.unknown_non_optimal) == len(self.unknown):
+                break
+            ass  = [ (self.get_holds_function(x,0),  True) for x in holds ]
+            ass += [ (self.get_holds_function(x,0), False) for x in nholds]
+            ass += [                             (x, True) for x in shown]
+            # the pending model is not checked against itself
+            if own is not None:
+                self.control.assign_external(
+                    self.get_external(MODEL_DELETE_BETTER, own), False
+                )
+            self.unknown_new_non_optimal, self.unknown_own = [], own
             self.solve(assumptions = ass + self.assumptions,
                        on_model = self.on_model_unknown)
-        # print which unknown are not optimal
-        self.print_better_than_unknown(self.unknown_non_optimal, self.mapping)
-        # initialize array to update unknown
-        update_unknown = [self.last_model] if result == UNKNOWN else []
+            self.unknown_own = None
+            if own is not None:
+                self.control.assign_external(
+                    self.get_external(MODEL_DELETE_BETTER, own), True
+                )
+            # print which unknown are not optimal
+            self.print_better_than_unknown(
+                self.unknown_new_non_optimal, self.mapping
+            )
+            self.unknown_non_optimal.update(self.unknown_new_non_optimal)
         # release non optimal, and update unknown
+        update_unknown = []
         for i in self.unknown:
             if i in self.unknown_non_optimal:
                 self.control.release_external(
@@ -999,46 +1510,35 @@ class Solver:
                 update_unknown.append(i)
         self.unknown = update_unknown
         # update not_improving
-        self.not_improving = [
-            x for x in self.not_improving
-            if x not in set([(y,0) for y in self.unknown_non_optimal])
-        ]
-        # if UNKNOWN, add delete better for last model (w/out unsat constraint)
-        if result == UNKNOWN:
-            x, y  = MODEL_DELETE_BETTER, self.last_model
-            parts = [(self.unsat_program, [x, y]), (VOLATILE_EXT,  [x,y])]
-            self.ground(parts, self)
-            #self.control.ground(parts, self)
-            # also, add mapping
-            self.mapping[self.last_model] = self.models
-        #
-        # leftover from merge
-        #
-        #self.not_improving.difference_update(
-        #    [(x,0) for x in self.unknown_non_optimal]
-        #)
-        ## add delete better for last model (without unsat constraint)
-        #x, y  = MODEL_DELETE_BETTER, self.last_model
-        #parts = [(PREFP, [x, y]), (VOLATILE_EXT,  [x,y])]
-        #self.ground(parts, self)
+        if self.unknown_non_optimal:
+            self.not_improving = [
+                (x, y) for (x, y) in self.not_improving
+                if y != 0 or x not in self.unknown_non_optimal
+            ]
 
     #
     # meta-programming
     #
 
-    def meta_simple(self):
-        # choose meta implementation
+    def get_metasp(self):
         if self.options.meta_binary:
-            meta = metasp.MetaspBinary(self)
+            return metasp.MetaspBinary(self)
         elif self.options.meta_sat:
-            meta = metasp.MetaspSAT(self)
-        else:
-            meta = metasp.MetaspPython(self)
+            return metasp.MetaspSAT(self)
+        return metasp.MetaspPython(self)
+
+    def meta_simple(self):
+        # choose meta implementation
+        meta = self.get_metasp()
         # get meta program
         meta_program = meta.get_meta_program()
         # add and ground
         self.control.add(METAPROGRAM, [], meta_program)
         self.ground([(METAPROGRAM, [])])
+        # if queries: solve them with assumptions
+        if self.options.queries is not None:
+            self.solve_queries()
+            return
         # if query: adds the query and grounds
         if self.options.meta_query:
             qname, qprogram = QUERY, QUERY_PROGRAM
@@ -1047,20 +1547,147 @@ class Solver:
         # solve single
         self.solve_single()
 
+    # a query is a list of literals 'a' or 'not a' separated by commas
+    def parse_query(self, line):
+        line = line.strip()
+        if line.endswith("."):
+            line = line[:-1]
+        query = []
+        for literal in utils.split_terms(line, ","):
+            sign = True
+            if literal.startswith("not "):
+                sign, literal = False, literal[4:].strip()
+            try:
+                query.append((clingo.parse_term(literal), sign))
+            except Exception:
+                raise Exception(ERROR_QUERY.format(line))
+        return query
+
+    def read_queries(self):
+        if self.options.queries == "-":
+            _file = sys.stdin
+        else:
+            _file = open(self.options.queries)
+        try:
+            for line in iter(_file.readline, ""):
+                line = line.strip()
+                if line and not line.startswith("%"):
+                    yield line
+        finally:
+            if _file is not sys.stdin:
+                _file.close()
+
+    # the meta program is grounded once, and every query is solved
+    # under assumptions reusing the same ground program
+    def solve_queries(self):
+        models, opt_models, more_models = 0, 0, False
+        symbolic_atoms = self.control.symbolic_atoms
+        for idx, line in enumerate(self.read_queries()):
+            query = self.parse_query(line)
+            self.printer.do_print(STR_QUERY.format(idx + 1, line))
+            self.models, self.opt_models, self.more_models = 0, 0, True
+            # a positive literal without atom can not hold
+            if any(sign and atom not in symbolic_atoms
+                   for atom, sign in query):
+                self.more_models = False
+                self.print_unsat()
+            else:
+                self.assumptions = query
+                self.solve_single()
+            sys.stdout.flush()
+            models += self.models
+            opt_models += self.opt_models
+            more_models = more_models or self.more_models
+        self.assumptions = []
+        self.models, self.opt_models = models, opt_models
+        self.more_models = more_models
+
     def meta_incremental(self):
         # choose meta implementation
-        if self.options.meta_binary:
-            meta = metasp.MetaspBinary(self)
-        elif self.options.meta_sat:
-            meta = metasp.MetaspSAT(self)
-        else:
-            meta = metasp.MetaspPython(self)
+        meta = self.get_metasp()
         # get programs
         base, params, incremental = meta.get_incremental_program()
         # add to control
         self.control.add(METAUNSAT_BASE, [], base)
         self.control.add(METAUNSAT, params, incremental)
 
+    #
+    # --auto
+    #
+
+    def auto_ground_once(self):
+        if not self.options.auto or self.options.max_models == 1 or \
+           self.options.meta == META_COMBINE or \
+           self.options.improve_limit is not None or \
+           self.options.initial_model is not None or \
+           self.options.hybrid is not None or \
+           self.options.retire is not None or \
+           self.options.updates or self.options.variants:
+            return False
+        self.do_set_holds_domain()
+        if len(self.holds_open) > AUTO_GROUND_ONCE:
+            return False
+        self.options.auto_choices.append("ground-once")
+        return True
+
+    #
+    # retire
+    #
+
+    def get_rules(self):
+        try:
+            return self.control.statistics['problem']['lp']['rules']
+        except (KeyError, TypeError):
+            return 0
+
+    def new_control(self):
+        self.control = self.control_factory()
+        self.control_proxy.control = self.control
+        self.control.configuration.solve.opt_mode = 'ignore'
+        self.externals, self.improving, self.not_improving = dict(), [], []
+        self.retire_holds, self.grounded_delete_better = dict(), False
+        if self.dominance_archive is not None:
+            self.dominance_archive.clear()
+        self.rebuilds += 1
+
+    def replay_optimal_models(self):
+        holds, nholds = self.holds, self.nholds
+        records, self.optimal_records = self.optimal_records, []
+        for self.holds, self.nholds, args in records:
+            self.ground_holds(args[0])
+            self.handle_optimal_model(*args) # appends to self.optimal_records
+        self.holds, self.nholds = holds, nholds
+
+    #
+    # dominance archive
+    #
+
+    def set_dominance_archive(self):
+        archive = preferences.Archive(self.control, self.underscores)
+        if not archive.supported():
+            self.printer.print_warning(WARNING_DOMINANCE_ARCHIVE)
+            return
+        self.dominance_archive = archive
+        self.stats_functions.append(archive.stats)
+
+    # returns True if the last model is worse than some optimal model,
+    # and in that case grounds the unsat program for the optimal model
+    def ground_dominated(self):
+        if self.dominance_archive is None:
+            return False
+        step = self.dominance_archive.better(self.holds)
+        if step is None:
+            return False
+        self.ground(self.get_preference_parts(step, 0, False, False), self)
+        return True
+
+    def retire_stats(self):
+        return STR_RETIRE.format(self.retired, self.rebuilds)
+
+    def auto_stats(self):
+        choices = self.options.auto_choices
+        return STR_AUTO.format(", ".join(choices) if choices else "basic")
+
     #
     # exiting
     #
@@ -1068,10 +1695,11 @@ class Solver:
     def print_stats(
         self, interrupted=False, solved=True, copy_statistics=None, _file=None
     ):
+        extra = "".join([f() for f in self.stats_functions])
         self.printer.print_stats(
             self.control, self.models, self.more_models, self.opt_models,
             self.options.non_optimal, self.options.stats,
-            interrupted, solved, copy_statistics, _file
+            interrupted, solved, copy_statistics, _file, extra
         )
 
     def signal_on_solving(self):
@@ -1107,6 +1735,8 @@ class Solver:
         optimal = controller.GeneralControllerHandleOptimal(self)
         enumeration = controller.EnumerationController(self)
         self.on_optimal = on_optimal = controller.OnOptimalController(self)
+        warm_start = controller.WarmStartController(self)
+        checkpoint = controller.CheckpointController(self, general, optimal)
         # MethodController
         if self.options.solving_mode == "weak":
             method = controller.ApproxMethodController(self)
@@ -1116,12 +1746,19 @@ class Solver:
         elif self.options.meta in [META_SIMPLE]:
             method = controller.MetaMethodController(self)
         else:
-            if self.options.ground_once:
+            if self.options.ground_once or self.auto_ground_once():
                 method = controller.GroundOnceMethodController(self)
             else:
                 method = controller.GroundManyMethodController(self)
         if self.options.improve_limit is not None:
             method = controller.ImproveLimitController(self, method)
+        if self.options.lns is not None:
+            method = controller.LNSController(self, method)
+        if self.options.dominance_archive:
+            method = controller.DominanceController(self, method)
+        retire = controller.RetireController(self, general, optimal, method)
+        restart = controller.RestartController(self, optimal)
+        decomposition = controller.DecomposeController(self, general)
 
         # loop
         try:
@@ -1129,31 +1766,51 @@ class Solver:
             general.start()
             optimal.start()
             method.start() # Approx and Meta finish here
+            restart.start()
             self.printer.do_print("Solving...")
+            # DECOMPOSE (finishes if the components combine and max_models is 1)
+            decomposed = decomposition.start()
+            # RESUME (the optimal models of the checkpoint are not recomputed)
+            checkpoint.start()
+            # WARM_START (the model found is the first one to improve)
+            warm = decomposed or warm_start.start()
             while True:
-                # START_LOOP
-                method.start_loop()
-                # SOLVE
-                method.solve()
-                if self.solving_result == SATISFIABLE:
-                    # SAT
-                    general.sat()
-                    optimal.sat()
-                elif self.solving_result == UNSATISFIABLE:
-                    # UNSAT
-                    general.unsat()
-                    method.unsat()
-                    enumeration.unsat()
-                    optimal.unsat()
-                    on_optimal.unsat()
-                elif self.solving_result == UNKNOWN:
-                    # UNKNOWN
-                    general.unknown()
-                    method.unsat()
-                    optimal.unknown()
-                    on_optimal.unsat()
-                # END_LOOP
-                general.end_loop()
+                try:
+                    if warm:
+                        general.sat()
+                        optimal.sat()
+                        general.end_loop()
+                    while True:
+                        # START_LOOP
+                        method.start_loop()
+                        # SOLVE
+                        method.solve()
+                        if self.solving_result == SATISFIABLE:
+                            # SAT
+                            general.sat()
+                            optimal.sat()
+                        elif self.solving_result == UNSATISFIABLE:
+                            # UNSAT
+                            general.unsat()
+                            method.unsat()
+                            enumeration.unsat()
+                            optimal.unsat()
+                            on_optimal.unsat()
+                            checkpoint.unsat()
+                        elif self.solving_result == UNKNOWN:
+                            # UNKNOWN
+                            general.unknown()
+                            method.unsat()
+                            optimal.unknown()
+                            on_optimal.unsat()
+                        # END_LOOP
+                        general.end_loop()
+                        retire.end_loop()
+                except EndException as e:
+                    # RESTART (the previous optimum is the first one to improve)
+                    if not restart.restart():
+                        raise e
+                    warm = restart.warm_start()
         except RuntimeError as e:
             if not self.exited:
                 self.printer.print_error("ERROR (clingo): {}".format(e))
@@ -1161,5 +1818,9 @@ class Solver:
         except EndException as e:
             # END
             pass
+        finally:
+            checkpoint.end()
+            if self.trace is not None:
+                self.trace.end()
 
 
@@ -0,0 +1,101 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+import csv
+import json
+import time
+from . import preferences
+
+
+#
+# DEFINES
+#
+
+JSON    = ".json"
+COLUMNS = ["time", "model", "step", "optimal"]
+
+
+#
+# Trace
+#
+# Writes a line for every model (CSV, or JSON lines if the file ends with
+# .json) with the time since solving started, the number of the model,
+# the step, whether it is known to be optimal, and the quality of every
+# preference statement (see Preference.quality in preferences.py)
+#
+
+class Trace:
+
+    def __init__(self, _file):
+        self.start       = time.time()
+        self.json        = _file.endswith(JSON)
+        self.file        = open(_file, "w")
+        self.writer      = None if self.json else csv.writer(self.file)
+        self.preferences = None
+        self.names       = None
+        self.row         = None
+
+    def __set_preferences(self, solver):
+        control, u = solver.control, solver.underscores
+        self.preferences, _ = preferences.get_preferences(
+            control.symbolic_atoms, u, False
+        )
+        self.names = sorted(self.preferences.keys(), key=str)
+        if not self.json:
+            self.writer.writerow(COLUMNS + [str(x) for x in self.names])
+
+    def __write(self, optimal):
+        if self.row is None:
+            return
+        _time, number, step, quality = self.row
+        if self.json:
+            self.file.write(json.dumps({
+                "time" : _time, "model" : number, "step" : step,
+                "optimal" : optimal, "quality" : dict(
+                    [(str(x), q) for x, q in zip(self.names, quality)]
+                )
+            }) + "\n")
+        else:
+            self.writer.writerow(
+                ["{:.3f}".format(_time), number, step, int(optimal)] +
+                ["" if q is None else json.dumps(q) for q in quality]
+            )
+        self.file.flush()
+        self.row = None
+
+    def on_answer(self, solver):
+        if self.preferences is None:
+            self.__set_preferences(solver)
+        self.__write(False)
+        holds = frozenset(solver.holds)
+        self.row = (
+            time.time() - self.start, solver.models, solver.step,
+            [self.preferences[x].quality(holds) for x in self.names]
+        )
+
+    def on_status(self, optimal):
+        self.__write(optimal)
+
+    def end(self):
+        self.__write(False)
+        self.file.close()
@@ -33,6 +33,8 @@ from ..utils import utils
 # predicates
 PREFERENCE         = "preference"   # arity 2 and 5
 OPTIMIZE           = "optimize"     # arity 1
+VARIANT            = utils.VARIANT  # arity 1
+VARIANT_ON         = utils.VARIANT_ON # arity 1
 HOLDS              = "holds"        # arity 2
 SAT                = "sat"          # arity 1
 BF                 = "bf"           # arity 1
@@ -73,6 +75,13 @@ TRUE_ATOM = """
 ##true.
 """
 
+# with --variants, every optimize statement is a variant
+# that is optimized when its external is true
+VARIANT_RULES = """
+#external ##""" + VARIANT_ON + """(X) : ##""" + VARIANT + """(X).
+##""" + OPTIMIZE + """(X) :- ##""" + VARIANT + """(X), ##""" + VARIANT_ON + """(X).
+"""
+
 # rule for pref_dom/1
 PREF_DOM_RULE = """
 ##pref_dom(X) :- ##preference(X,_).
@@ -132,6 +141,7 @@ class Statement:
 
     underscores = ""
     domains  = set()
+    variants = False
 
     def __init__(self):
         self.number   = None
@@ -236,7 +246,8 @@ class OStatement(Statement):
     def str(self):
         statement_body = body2str(self.body) if self.body is not None else ""
         arrow = " :- " if statement_body != "" else ""
-        out = Statement.underscores + OPTIMIZE 
+        name = VARIANT if Statement.variants else OPTIMIZE
+        out = Statement.underscores + name
         out += "({}){}{}.\n".format(ast2str(self.name), arrow, statement_body)
         return out
 
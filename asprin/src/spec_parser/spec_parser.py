@@ -206,6 +206,7 @@ class Parser(object):
 
         underscores = "_" + ("_" * self.lexer.get_underscores())
         ast.Statement.underscores = underscores
+        ast.Statement.variants = self.options['variants']
         program, type = BASE, EMPTY
 
         # add elements of the list
@@ -216,6 +217,8 @@ class Parser(object):
                 if program == BASE and type == EMPTY:
                     code += underscores + END
                 self.__update_program(program, type, code, i[2])
+            if i[0] == OPTIMIZE and self.options['optimize'] is not None:
+                continue
             if i[0] == PREFERENCE or i[0] == OPTIMIZE:
                 # translate statement
                 self.__update_program(SPEC, EMPTY, i[1].str())
@@ -231,6 +234,13 @@ class Parser(object):
             out +=  ast.BF_ENCODING.replace("##",underscores)
         out += "\n" + ast.TRUE_ATOM.replace("##",underscores)
         out += "\n" + ast.PREF_DOM_RULE.replace("##",underscores)
+        if ast.Statement.variants:
+            out += "\n" + ast.VARIANT_RULES.replace("##",underscores)
+        # option --optimize replaces the optimize statements
+        if self.options['optimize'] is not None:
+            out += "\n{}{}({}).\n".format(
+                underscores, ast.OPTIMIZE, self.options['optimize']
+            )
         self.__update_program(SPEC,EMPTY,out)
 
         return self.programs, underscores
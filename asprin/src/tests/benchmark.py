@@ -0,0 +1,155 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+#!/usr/bin/python
+from __future__ import print_function
+import os
+import re
+import subprocess
+import tempfile
+import time
+from . import utils
+
+# compares the default options with --auto, running every test
+OPTIONS = [[""], ["--auto"]]
+WIDTH = 12
+TIME = "{:>" + str(WIDTH) + ".3f}"
+ERROR = "{:>" + str(WIDTH - 1) + ".3f}!"
+TOTAL = "TOTAL"
+FAILED = "(! marks wrong results)"
+
+# grounding benchmark: preferences over many elements
+GROUNDING_STEPS = 10
+GROUNDING_TYPES = [
+    ("less(weight)",      "X\\10,X :: ",       ""),
+    ("more(weight)",      "X\\10,X :: ",       ""),
+    ("clingo_minimize",   "X\\10,X\\2,X :: ", ""),
+    ("maxmin",            "X\\4,X\\10,X :: ", ""),
+    ("minmax",            "X\\4,X\\10,X :: ", ""),
+    ("less(cardinality)", "",                ""),
+    ("less(cardinality)", "",                "--const-nb totalizer=1"),
+    ("more(cardinality)", "",                ""),
+    ("more(cardinality)", "",                "--const-nb totalizer=1"),
+]
+GROUNDING_SIZE = r'^{}\s*:\s*(\d+)'
+GROUNDING_KEYS = ["Rules", "Atoms"]
+GROUNDING_PROGRAM = """\
+dom(1..{0}).
+{1} {{ a(X) : dom(X) }}.
+#preference(p,{2}){{ {3}a(X) : dom(X) }}.
+#optimize(p).
+"""
+
+class Benchmark:
+
+    def __init__(self, options):
+        self.options = options
+        self.rows = []
+
+    def run_test(self, dir, test):
+        tmp = tempfile.TemporaryFile()
+        start = time.time()
+        subprocess.call(test.command, stdout=tmp, stderr=subprocess.STDOUT,
+                        shell=True, cwd=dir)
+        elapsed = time.time() - start
+        tmp.seek(0)
+        output = tmp.read()
+        if isinstance(output, bytes):
+            output = output.decode()
+        return elapsed, utils.Result(output).same(test)
+
+    def run(self, dir):
+        for i in sorted(os.listdir(dir)):
+            abs_i = os.path.join(dir, i)
+            if os.path.isdir(abs_i):
+                self.run(abs_i)
+            elif str(abs_i)[-3:] == ".lp":
+                with open(abs_i, 'r') as f:
+                    string = f.read()
+                row = []
+                for options in self.options:
+                    test = utils.Test(string, options)
+                    row.append(self.run_test(dir, test))
+                self.rows.append((abs_i, row))
+                self.print_row(abs_i, row)
+
+    def print_row(self, name, row):
+        out = ""
+        for elapsed, ok in row:
+            out += (TIME if ok else ERROR).format(elapsed)
+        print(out + "  " + name)
+
+    def print_header(self):
+        print("".join([
+            ("{:>" + str(WIDTH) + "}").format(" ".join(o).strip() or "default")
+            for o in self.options
+        ]) + "  " + FAILED)
+
+    def print_total(self):
+        out = ""
+        for idx in range(len(self.options)):
+            total = sum([row[idx][0] for _, row in self.rows])
+            ok = all([row[idx][1] for _, row in self.rows])
+            out += (TIME if ok else ERROR).format(total)
+        print(out + "  " + TOTAL)
+
+def main(path, options=OPTIONS):
+    benchmark = Benchmark(options)
+    benchmark.print_header()
+    benchmark.run(path)
+    benchmark.print_total()
+
+# the size of the ground program is read from the output of --stats
+def grounding_size(output):
+    out = ""
+    for key in GROUNDING_KEYS:
+        match = re.search(GROUNDING_SIZE.format(key), output, re.M)
+        value = match.group(1) if match else "-"
+        out += ("{:>" + str(WIDTH) + "}").format(value)
+    return out
+
+def grounding(elements, steps=GROUNDING_STEPS):
+    print("".join([
+        ("{:>" + str(WIDTH) + "}").format(i.lower())
+        for i in ["time"] + GROUNDING_KEYS
+    ]) + "  elements={} steps={}".format(elements, steps))
+    for _type, weight, options in GROUNDING_TYPES:
+        with tempfile.NamedTemporaryFile(mode='w', suffix=".lp",
+                                         delete=False) as f:
+            f.write(GROUNDING_PROGRAM.format(elements, elements//2, _type,
+                                             weight))
+        command = "{}{} --steps={} --stats {}".format(
+            utils.ASPRIN, f.name, steps, options
+        )
+        tmp = tempfile.TemporaryFile()
+        start = time.time()
+        subprocess.call(command, stdout=tmp, stderr=subprocess.STDOUT,
+                        shell=True)
+        elapsed = time.time() - start
+        os.remove(f.name)
+        tmp.seek(0)
+        output = tmp.read()
+        if isinstance(output, bytes):
+            output = output.decode()
+        print(TIME.format(elapsed) + grounding_size(output) + "  " +
+              (_type + " " + options).strip())
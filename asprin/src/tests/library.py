@@ -0,0 +1,210 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+
+#!/usr/bin/python
+from __future__ import print_function
+import os
+import sys
+import json
+import shlex
+import shutil
+import tempfile
+import subprocess
+
+# tests that asprin, used as a library, writes nothing to stdout,
+# and that the server and the batch mode write only JSON lines to stdout,
+# solving the system tests with some options that use different paths
+
+PATH = os.path.dirname(os.path.realpath(__file__))
+ROOT = os.path.join(PATH, "..", "..", "..")
+ASPRIN = [sys.executable, os.path.join(PATH, "..", "..", "asprin.py")]
+OPTIONS_TESTS = os.path.join(PATH, "solver", "options")
+
+API_OPTIONS = [
+    [],
+    ["--no-native"],
+    ["--approximation=weak"],
+    ["--meta=simple"],
+    ["--non-optimal"],
+    ["--on-opt-heur=+,p,1,false"],
+]
+
+SERVER_OPTIONS = [
+    [],
+    ["--approximation=weak"],
+]
+SERVER_WORKERS = "--server=2"
+
+BATCH_OPTIONS = [
+    ["0"],
+    ["0", "--approximation=weak"],
+    ["1", "--meta=simple"],
+]
+BATCH_WORKERS = "--batch={},2"
+BATCH_ENCODING = """\
+1 { a(X) : dom(X) }.
+#show a/1.
+#preference(p, subset){ a(X) : dom(X) }.
+#preference(q, less(cardinality)){ a(X) : dom(X) }.
+#preference(r, lexico){ 1::**p; 2::**q }.
+#optimize(r).
+"""
+BATCH_INSTANCES = ["dom(1..{}).".format(i) for i in range(1, 5)]
+
+# solves the jobs (directory, arguments) given as json in argv[2]
+API_CHILD = """\
+import os, sys, json
+sys.path.insert(0, sys.argv[1])
+from asprin.src.main import api
+for directory, args in json.loads(sys.argv[2]):
+    os.chdir(directory)
+    try:
+        for model in api.solve([], args):
+            pass
+    except Exception as e:
+        sys.stderr.write("{}: {}\\n".format(args, e))
+"""
+
+def error(message, result):
+    print("#############################################################")
+    print("ERROR: " + message)
+    print("RESULT:")
+    print(result)
+    print("#############################################################\n")
+    return True
+
+# returns the list of (directory, arguments) of the system tests in path
+# (but those in solver/options, whose commands use the shell)
+def get_jobs(path):
+    jobs = []
+    for directory, _, files in sorted(os.walk(path)):
+        if os.path.realpath(directory).startswith(OPTIONS_TESTS):
+            continue
+        for i in sorted(files):
+            if not i.endswith(".lp"):
+                continue
+            with open(os.path.join(directory, i)) as f:
+                args = shlex.split(f.readline()[1:])[1:]
+            jobs.append((directory, args))
+    return jobs
+
+def run(command, stdin=None):
+    process = subprocess.Popen(
+        command, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    )
+    output = process.communicate(stdin.encode() if stdin else None)[0]
+    return process.returncode, output.decode()
+
+def test_api(path):
+    errors = False
+    jobs = get_jobs(path)
+    for options in API_OPTIONS:
+        print("Testing the library API with options {}...".format(options))
+        jobs_options = [(d, args + options) for d, args in jobs]
+        code, output = run([sys.executable, "-c", API_CHILD, ROOT,
+                            json.dumps(jobs_options)])
+        if code:
+            errors = error("the test failed with code {}".format(code), output)
+        elif output:
+            errors = error("output written to stdout", output)
+    return errors
+
+# the files of the arguments are made absolute
+def get_server_request(_id, directory, args):
+    options = []
+    for i in args:
+        if os.path.isfile(os.path.join(directory, i)):
+            i = os.path.abspath(os.path.join(directory, i))
+        options.append(i)
+    request = {"jsonrpc": "2.0", "id": _id, "method": "solve",
+               "params": {"inputs": [], "options": options}}
+    return json.dumps(request)
+
+def test_server(path):
+    errors = False
+    jobs = get_jobs(path)
+    for options in SERVER_OPTIONS:
+        print("Testing the server with options {}...".format(options))
+        requests = [get_server_request(idx, d, args + options)
+                    for idx, (d, args) in enumerate(jobs)]
+        requests.append(json.dumps({"jsonrpc": "2.0", "method": "exit"}))
+        code, output = run(ASPRIN + [SERVER_WORKERS], "\n".join(requests) + "\n")
+        responses = set()
+        for line in output.splitlines():
+            try:
+                message = json.loads(line)
+            except ValueError:
+                errors = error("the server wrote a non JSON line", line)
+                break
+            if "method" not in message:
+                responses.add(message.get("id"))
+        else:
+            if code or len(responses) != len(jobs):
+                errors = error("missing responses (code {})".format(code),
+                               output)
+    return errors
+
+def test_batch():
+    errors = False
+    directory = tempfile.mkdtemp()
+    try:
+        encoding = os.path.join(directory, "encoding.lp")
+        with open(encoding, "w") as f:
+            f.write(BATCH_ENCODING)
+        instances = os.path.join(directory, "instances")
+        os.mkdir(instances)
+        for idx, instance in enumerate(BATCH_INSTANCES):
+            name = os.path.join(instances, "i{}.lp".format(idx))
+            with open(name, "w") as f:
+                f.write(instance)
+        for options in BATCH_OPTIONS:
+            print("Testing the batch mode with options {}...".format(options))
+            command = ASPRIN + [BATCH_WORKERS.format(instances), encoding]
+            code, output = run(command + options)
+            results = 0
+            for line in output.splitlines():
+                try:
+                    result = json.loads(line)
+                except ValueError:
+                    errors = error("the batch mode wrote a non JSON line", line)
+                    break
+                if "error" not in result:
+                    results += 1
+            else:
+                if code or results != len(BATCH_INSTANCES):
+                    errors = error("missing results (code {})".format(code),
+                                   output)
+    finally:
+        shutil.rmtree(directory)
+    return errors
+
+def main(path):
+    errors = test_api(path)
+    errors = test_server(path) or errors
+    errors = test_batch() or errors
+    if errors:
+        print("ERROR: There were errors in the tests")
+    else:
+        print("OK: All tests were successful")
+    return errors
@@ -0,0 +1,112 @@
+# MIT License
+# 
+# Copyright (c) 2017 Javier Romero
+# 
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+# 
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+# 
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+# -*- coding: utf-8 -*-
+
+
+#!/usr/bin/python
+from __future__ import print_function
+import subprocess
+import sys
+from ..solver.metasp import reify
+
+# tests the translation of lp2sat's dimacs output to meta facts,
+# replacing clingo, lp2normal2 and lp2sat by local stand-ins
+
+PREFIX = "m_"
+
+# a comment without atom, the header, a clause in two lines,
+# and two clauses in one line
+DIMACS = """\
+c generated by a stand-in
+p cnf 3 3
+c 1 a
+c 2 b(1)
+1 -2
+3 0
+-1 0 2 0
+"""
+
+FACTS = """\
+m_rule(choice(0),normal(0)). m_literal_tuple(0). m_atom_tuple(0,1..3).
+m_output(a,1). m_literal_tuple(1). m_literal_tuple(1,1).
+m_output(b(1),2). m_literal_tuple(2). m_literal_tuple(2,2).
+m_rule(disjunction(1),normal(3)). m_literal_tuple(3). \
+m_literal_tuple(3,-1). m_literal_tuple(3,2). m_literal_tuple(3,-3).
+m_rule(disjunction(1),normal(4)). m_literal_tuple(4). m_literal_tuple(4,1).
+m_rule(disjunction(1),normal(5)). m_literal_tuple(5). m_literal_tuple(5,-2).
+"""
+
+# prints the program it is given (as clingo --output=smodels <file>)
+CLINGO = [sys.executable, "-c",
+          "import sys; sys.stdout.write(open(sys.argv[-1]).read())"]
+CAT = ["cat"]
+FAIL = [sys.executable, "-c", "import sys; sys.exit(1)"]
+
+def error(message, expected, result):
+    print("#############################################################")
+    print("ERROR: " + message)
+    print("EXPECTED:")
+    print(expected)
+    print("RESULT:")
+    print(result)
+    print("#############################################################\n")
+    return True
+
+def test_dimacs_to_facts():
+    errors = False
+    print("Testing dimacs_to_facts()...")
+    result = "".join(reify.dimacs_to_facts(DIMACS.splitlines(True), PREFIX))
+    if result != FACTS:
+        errors = error("different facts", FACTS, result)
+    print("Testing dimacs_to_facts() with bytes and \\r\\n...")
+    lines = [i.encode() for i in DIMACS.replace("\n", "\r\n").splitlines(True)]
+    result = "".join(reify.dimacs_to_facts(lines, PREFIX))
+    if result != FACTS:
+        errors = error("different facts", FACTS, result)
+    return errors
+
+def test_reify_from_string_through_sat():
+    errors = False
+    print("Testing reify_from_string_through_sat()...")
+    result = reify.reify_from_string_through_sat(
+        DIMACS, PREFIX, clingo=CLINGO, lp2normal=CAT, lp2sat=CAT
+    )
+    if result != FACTS:
+        errors = error("different facts", FACTS, result)
+    print("Testing reify_from_string_through_sat() with a failing lp2sat...")
+    try:
+        result = reify.reify_from_string_through_sat(
+            DIMACS, PREFIX, clingo=CLINGO, lp2normal=CAT, lp2sat=FAIL
+        )
+        errors = error("no error", "CalledProcessError", result)
+    except subprocess.CalledProcessError:
+        pass
+    return errors
+
+def main():
+    errors = test_dimacs_to_facts()
+    errors = test_reify_from_string_through_sat() or errors
+    if errors:
+        print("ERROR: There were errors in the tests")
+    else:
+        print("OK: All tests were successful")
+    return errors
@@ -25,12 +25,26 @@
 from __future__ import print_function
 import os
 import sys
+import tempfile
 import subprocess
 from . import utils
 
 PATH = os.path.dirname(os.path.realpath(__file__))
 DIR = "--test-dir="
 ALL = "--all"
+COMPARE = "--compare"
+GROUNDING = "--grounding="
+SAT = "--sat"
+API = "--api"
+# files used by the options below
+META_CACHE = os.path.join(tempfile.gettempdir(),
+                          "asprin_meta_cache_{}".format(os.getpid()))
+ALL_QUERIES = os.path.join(PATH, "solver", "options", "all.queries")
+INITIAL_MODEL = os.path.join(PATH, "solver", "options", "test003.model")
+CHECKPOINT = os.path.join(tempfile.gettempdir(),
+                          "asprin_checkpoint_{}.json".format(os.getpid()))
+TRACE = os.path.join(tempfile.gettempdir(),
+                     "asprin_trace_{}.csv".format(os.getpid()))
 OPTIONS = [
     [""],
     ["--delete-better"],
@@ -39,6 +53,17 @@ OPTIONS = [
     ["--no-opt-improving"],
     ["--volatile-improving"],
     ["--volatile-optimal"],
+    ["--auto"],
+    ["--retire=2,10"],
+    ["--checkpoint=" + CHECKPOINT],
+    ["--updates < " + os.devnull],
+    ["--variants"],
+    ["--trace=" + TRACE],
+    ["--decompose"],
+    ["--dominance-archive"],
+    ["--lns=0.5,50"],
+    ["--no-native"],
+    ["--no-native --const-nb totalizer=1"],
     ["--approximation=heuristic"],
     ["--approximation=heuristic --const-nb heuristic_aso=2"],
     ["--approximation=heuristic --const-nb heuristic_aso=2 --const-nb use_get_sequence=2 "],
@@ -49,12 +74,21 @@ OPTIONS = [
     ["--approximation=weak --const-nb approx_aso=2 --const-nb use_get_sequence=2 "],
     ["""--approximation=weak --const-nb approx_poset=2 --const-nb approx_aso=3 \
      --const-nb approx_pareto=2 --const-nb approx_and=2"""],
+    ["--hybrid=10"],
+    ["--initial-model=" + INITIAL_MODEL],
     ["--improve-limit=0,5"],
     ["--improve-limit=1,all,100"],
+    ["--improve-limit=1,all,100 --improve-schedule=luby"],
+    ["--improve-limit=1,all,100 --improve-schedule=adaptive"],
+    ["--improve-limit=1,all,100 --improve-batch=5"],
     ["--on-opt-heur=+,p,-1,sign --on-opt-heur=-,p,1,sign"],
     ["--on-opt-heur=+,s,1,true --on-opt-heur=-,s,1,false"],
     ["--meta=simple"],
     ["--meta=combine"],
+    # twice, the second run reuses the cache of the first one
+    ["--meta=simple --meta-cache=" + META_CACHE],
+    ["--meta=simple --meta-cache=" + META_CACHE],
+    ["--meta=simple --queries=" + ALL_QUERIES],
     # uncomment only if clingo binary is installed
     #["--meta=simple,bin"],
     #["--meta=combine,bin"],
@@ -65,6 +99,41 @@ OPTIONS = [
 
 EXCLUDE = {}
 
+# tests using --approximation (for options that require the basic solving method)
+APPROXIMATION = [
+    os.path.join(PATH, "asprin_lib", "test023.lp"),
+    os.path.join(PATH, "asprin_lib", "test025.lp"),
+    os.path.join(PATH, "asprin_lib", "test027.lp"),
+    os.path.join(PATH, "program_parser", "basic", "test001.lp"),
+    os.path.join(PATH, "program_parser", "basic", "test002.lp"),
+    os.path.join(PATH, "program_parser", "basic", "test003.lp"),
+    os.path.join(PATH, "program_parser", "basic", "test004.lp"),
+    os.path.join(PATH, "solver", "solver", "test008.lp"),
+    os.path.join(PATH, "solver", "solver", "test009.lp"),
+    os.path.join(PATH, "solver", "solver", "test010.lp"),
+    os.path.join(PATH, "solver", "solver", "test011.lp"),
+    os.path.join(PATH, "solver", "solver", "test012.lp"),
+    os.path.join(PATH, "solver", "solver", "test013.lp"),
+]
+
+# tests using --meta=no (for options that require --meta=simple)
+CP = os.path.join(PATH, "asprin_lib", "cp")
+
+EXCLUDE["--retire=2,10"] = APPROXIMATION
+EXCLUDE["--dominance-archive"] = APPROXIMATION
+EXCLUDE["--lns=0.5,50"] = APPROXIMATION
+EXCLUDE["--hybrid=10"] = APPROXIMATION
+EXCLUDE["--initial-model=" + INITIAL_MODEL] = APPROXIMATION
+EXCLUDE["--checkpoint=" + CHECKPOINT] = APPROXIMATION
+EXCLUDE["--updates < " + os.devnull] = APPROXIMATION + [
+    CP, # uses --meta=no
+]
+EXCLUDE["--decompose"] = APPROXIMATION
+EXCLUDE["--variants"] = APPROXIMATION + [
+    CP, # uses --meta=no
+    os.path.join(PATH, "program_parser", "program_parser", "test004.lp"), # many #optimize statements
+]
+
 EXCLUDE["--on-opt-heur=+,p,-1,sign --on-opt-heur=-,p,1,sign"] = [
     os.path.join(PATH, "program_parser", "basic", "test001.lp"), # uses --approximation=heuristic
     os.path.join(PATH, "program_parser", "basic", "test002.lp"), # uses --approximation=heuristic
@@ -92,6 +161,17 @@ EXCLUDE["--preference-unsat $asprin/mine/asprin_lib_unsat.lp"] = [
     os.path.join(PATH, "spec_parser", "spec_parser", "test026.lp"), # adds new preference programs
 ]
 
+EXCLUDE["--meta=simple --meta-cache=" + META_CACHE] = EXCLUDE["--meta=simple"]
+EXCLUDE["--meta=simple --queries=" + ALL_QUERIES] = EXCLUDE["--meta=simple"] + [
+    CP, # uses --meta=no
+]
+
+# the tests in solver/options set their own options, and run only by default
+OPTIONS_TESTS = os.path.join(PATH, "solver", "options")
+for i in OPTIONS:
+    if i[0] != "":
+        EXCLUDE[i[0]] = EXCLUDE.get(i[0], []) + [OPTIONS_TESTS]
+
 add_option = False
 # to add one option to all OPTIONS, uncomment the next line and set option below
 #add_option = True
@@ -168,6 +248,23 @@ def main(args):
             path = i[len(DIR):]
             args.remove(i)
             break
+    for i in args:
+        if i.startswith(GROUNDING):
+            from . import benchmark
+            benchmark.grounding(int(i[len(GROUNDING):]))
+            return
+    if SAT in args:
+        from . import sat
+        sat.main()
+        return
+    if API in args:
+        from . import library
+        library.main(path)
+        return
+    if COMPARE in args:
+        from . import benchmark
+        benchmark.main(path)
+        return
     if ALL in args:
         options = OPTIONS
     else:
@@ -132,6 +132,14 @@ class Result(Test):
         print(self)
         print("#############################################################\n")
 
+    # as compare(), without printing
+    def same(self, test):
+        return self.count == 1 and \
+               self.satisfiable == test.satisfiable and \
+               self.unsatisfiable == test.unsatisfiable and \
+               self.error == test.error and \
+               "\n".join(self.answers) == "\n".join(test.answers)
+
     def compare(self, test):
         if self.count != 1:
             msg = "ERROR, UNSATISFIABLE or OPTIMUM FOUND messages"
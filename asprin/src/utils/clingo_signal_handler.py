@@ -43,7 +43,8 @@ class ClingoSignalHandler:
                  function_after_solving=None,
                  function_on_solving=None,
                  function_on_not_solving=None,
-                 function_on_not_solved=None
+                 function_on_not_solved=None,
+                 handle_signals=True
                 ):
         # public
         self.statistics = None
@@ -66,11 +67,13 @@ class ClingoSignalHandler:
         if self.function_on_not_solved is None:
             self.function_on_not_solved = self.on_not_solved
         self.condition = threading.Condition()
+        self.timer_lock = threading.Lock()
         self.solving = False
         self.result = None
-        # signal handling
-        signal.signal(signal.SIGTERM, self.signal_handler)
-        signal.signal(signal.SIGINT, self.signal_handler)
+        # signal handling (not when asprin is used as a library)
+        if handle_signals:
+            signal.signal(signal.SIGTERM, self.signal_handler)
+            signal.signal(signal.SIGINT, self.signal_handler)
 
     #
     # private: printing funtions
@@ -116,6 +119,14 @@ class ClingoSignalHandler:
         else:
             self.function_on_not_solved()
 
+    # private
+    # the timer may fire after the solve call returns, and then
+    # it must not interrupt the next one
+    def timeout(self):
+        with self.timer_lock:
+            if self.solving:
+                self.control.interrupt()
+
     # private
     def stop(self, result):
         self.result = result
@@ -137,12 +148,21 @@ class ClingoSignalHandler:
                 handle.wait()
 
     # public
+    # if timeout is given, the search is interrupted after timeout seconds
     def solve(self, *args, **kwargs):
+        timeout, timer = kwargs.pop('timeout', None), None
+        if timeout is not None:
+            timer = threading.Timer(timeout, self.timeout)
         self.solving = True
+        if timer is not None:
+            timer.start()
         # self.control.solve(*args, **kwargs)
         self.do_solve(self.control, *args, **kwargs)
         self.solved = True
-        self.solving = False
+        with self.timer_lock:
+            self.solving = False
+        if timer is not None:
+            timer.cancel()
         if self.interrupted:
             self.function_on_solving()
         elif self.print_after_solving:
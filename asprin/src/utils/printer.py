@@ -26,6 +26,7 @@ from ..utils import clingo_stats
 from ..utils import utils
 from ..utils import clingo_signal_handler
 import sys
+import threading
 
 BASE = utils.BASE
 WARNING_INCLUDED_FILE = "<cmd>: warning: already included file:\n  {}\n"
@@ -36,11 +37,26 @@ INTERRUPT = clingo_signal_handler.INTERRUPT.format("asprin")
 SUMMARY_STR = clingo_signal_handler.SUMMARY_STR
 STATS_STR = clingo_signal_handler.STATS_STR
 
+# printing can be disabled for the printers created in a thread (used by the
+# library API), and they keep the setting when they are used in other threads
+# (like the clingo threads calling on_model)
+local = threading.local()
+
+def set_silent(silent):
+    local.silent = silent
+
+def is_silent():
+    return getattr(local, 'silent', False)
+
+
 class Printer:
 
     messages = 0  # class variables
     last     = "" #
 
+    def __init__(self):
+        self.silent = is_silent()
+
     #
     # errors and warnings
     #
@@ -57,12 +73,16 @@ class Printer:
         return False
 
     def __print_error(self, string, **kwargs):
+        if self.silent:
+            return
         if not self.__last(string):
             sys.stdout.flush()
             print(string, file=sys.stderr, **kwargs)
             self.__check_messages(1)
 
     def print_error_string(self, string):
+        if self.silent:
+            return
         if not self.__last(string):
             sys.stdout.flush()
             print(string, file=sys.stderr, end = "")
@@ -78,6 +98,8 @@ class Printer:
         self.__print_error(string)
 
     def print_warning(self, string, **kwargs):
+        if self.silent:
+            return
         if not self.__last(string):
             sys.stdout.flush()
             print(string, file=sys.stderr, **kwargs)
@@ -99,7 +121,8 @@ class Printer:
     # simply print
     #
     def do_print(self, *args, **kwargs):
-        print(*args, **kwargs)
+        if not self.silent:
+            print(*args, **kwargs)
 
     #
     # stats
@@ -107,7 +130,9 @@ class Printer:
 
     def print_stats(self, ctl, models, more_models,
                     opt_models, non_optimal, stats,
-                    interrupted, solved, copy_statistics, _file):
+                    interrupted, solved, copy_statistics, _file, extra=""):
+        if self.silent:
+            return
         # interrupt
         out = ""
         if interrupted:
@@ -131,6 +156,7 @@ class Printer:
             out += clingo_stats.Stats().summary(statistics, False)
             if stats:
                 out += "\n" + clingo_stats.Stats().statistics(statistics)
+                out += extra
         # print
         print(out, file=_file if _file is not None else sys.stdout)
         sys.stdout.flush()
@@ -70,8 +70,12 @@ VOLATILE   = "volatile"
 MODEL      = "m"
 HOLDS      = "holds" 
 HOLDSP     = "holds'"
+CURRENT    = "current"
+CURRENTP   = "current'"
 PREFERENCE = "preference"
 OPTIMIZE   = "optimize"
+VARIANT    = "variant"
+VARIANT_ON = "variant_on"
 UNSAT      = "unsat"
 ERROR_PRED = "error"
 WARN_PRED  = "warning"
@@ -133,6 +137,7 @@ META_COMBINE = 3
 STR_MODEL_FOUND        = "MODEL FOUND"
 STR_MODEL_FOUND_STAR   = "MODEL FOUND *"
 SATISFIABLE            = "SATISFIABLE"
+UNSATISFIABLE          = "UNSATISFIABLE"
 
 #
 # global variables
@@ -213,6 +218,52 @@ class Capturer:
         # for
         return out
 
+# removes the line comments (from % to the end of line) that are outside strings
+def strip_comments(string):
+    out, comment, quoted, escaped = [], False, False, False
+    for char in string:
+        if comment:
+            if char != "\n":
+                continue
+            comment = False
+        elif quoted:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                quoted = False
+        elif char == '"':
+            quoted = True
+        elif char == "%":
+            comment = True
+            continue
+        out.append(char)
+    return "".join(out)
+
+# splits string at the separators that are outside parentheses and strings
+def split_terms(string, separators):
+    out, level, start, quoted, escaped = [], 0, 0, False, False
+    for idx, char in enumerate(string):
+        if quoted:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                quoted = False
+        elif char == '"':
+            quoted = True
+        elif char == "(":
+            level += 1
+        elif char == ")":
+            level -= 1
+        elif char in separators and level == 0:
+            out.append(string[start:idx].strip())
+            start = idx + 1
+    out.append(string[start:].strip())
+    return [i for i in out if i]
+
 class SilentException(Exception):
     pass
 